@@ -104,6 +104,10 @@ install -d %{buildroot}%{_gamesbindir}
 ln -s %{_gamesdatadir}/%{name}/__main__.py %{buildroot}%{_gamesbindir}/%{name}
 chmod +x %{buildroot}%{_gamesdatadir}/%{name}/__main__.py
 
+# auale_engine.py is the UCI engine launcher
+ln -s %{_gamesdatadir}/%{name}/auale_engine.py %{buildroot}%{_gamesbindir}/%{name}-engine
+chmod +x %{buildroot}%{_gamesdatadir}/%{name}/auale_engine.py
+
 # Install dist files
 pushd %{_builddir}/%{name}-%{version}/share
 install -D -m644 applications/%{name}.desktop \
@@ -166,6 +170,7 @@ rm -rf %{buildroot}
 %dir %{_iconsdir}/hicolor/scalable/apps
 %dir %{_iconsdir}/hicolor/scalable/mimetypes
 %{_gamesbindir}/%{name}
+%{_gamesbindir}/%{name}-engine
 %{_gamesdatadir}/%{name}/
 %{_datadir}/applications/%{name}.desktop
 %{_datadir}/glib-2.0/schemas/com.joansala.%{name}.gschema.xml
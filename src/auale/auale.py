@@ -33,7 +33,10 @@ from config import controls
 from config import options
 
 from gui.mixer import SoundMixer
+from gui.services import EnginePool
+from gui.services import PlayerManager
 from gui.windows import AualeWindow
+from uci import ProtocolTrace
 
 
 class Auale(Gtk.Application):
@@ -117,6 +120,22 @@ class Auale(Gtk.Application):
         Gtk.StyleContext.add_provider_for_screen(screen, provider, priority)
         provider.load_from_resource(f'{ base_path }/gtk/application.css')
 
+    def setup_engine_pool(self):
+        """Configures the engine pool shared by all windows"""
+
+        settings = self.get_local_settings()
+        pool_size = settings.get_int('engine-pool-size')
+        EnginePool.get_default().set_size(pool_size)
+        self.prespawn_engines()
+
+    def prespawn_engines(self):
+        """Starts idle engines for the current engine command"""
+
+        player_manager = PlayerManager()
+        player_manager.set_engine_command(self.get_engine_command())
+        command = player_manager.get_engine_command()
+        EnginePool.get_default().prespawn(command)
+
     def show_application_window(self, uri=None):
         """Adds or presents an application window"""
 
@@ -237,11 +256,13 @@ class Auale(Gtk.Application):
 
         self.setup_application_theme()
         self.connect_application_actions()
+        self.setup_engine_pool()
 
     def on_application_shutdown(self, application):
         """Handles the application shutdown"""
 
         SoundMixer.quit()
+        EnginePool.get_default().quit_engines()
         settings = self.get_local_settings()
         settings.sync()
 
@@ -302,6 +323,11 @@ class Auale(Gtk.Application):
         logging.basicConfig(stream=sys.stdout)
         logging.getLogger().setLevel(logging.DEBUG)
 
+    def on_trace_action_activate(self, action, value):
+        """Writes a protocol trace of new engines to a directory"""
+
+        ProtocolTrace.set_directory(value.get_string())
+
     def on_quit_action_activate(self, action, value):
         """Exits the application"""
 
@@ -327,3 +353,4 @@ class Auale(Gtk.Application):
         """Sets the engine command for the current session"""
 
         action.set_state(value)
+        self.prespawn_engines()
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Serves the built-in search through the UCI protocol on the standard
+input and output, answering from the opening book when it is enabled.
+"""
+
+import argparse
+import os
+import sys
+
+from book import OpeningBook
+from search import UCIService
+
+BASE_PATH = os.path.dirname(os.path.realpath(__file__))
+BOOK_PATH = os.path.join(BASE_PATH, 'data', 'engine', 'oware-book.bin')
+
+
+def parse_arguments():
+    """Parses the command line arguments"""
+
+    parser = argparse.ArgumentParser(description='Aualé UCI engine')
+    parser.add_argument('--book', default=BOOK_PATH, help='opening book')
+    parser.add_argument('--no-book', action='store_true',
+        help='do not use an opening book')
+
+    return parser.parse_args()
+
+
+def main():
+    """Serves UCI commands until quit is received"""
+
+    args = parse_arguments()
+    book = None if args.no_book else OpeningBook(args.book)
+    service = UCIService(sys.stdin, sys.stdout, book)
+    service.run()
+
+
+if __name__ == '__main__':
+    main()
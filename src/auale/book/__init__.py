@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 
+from .hashing import compute_hash_code
 from .opening_book import OpeningBook
+from .position_index import PositionIndex
+from .position_index import PositionIndexBuilder
 
 __all__ = [
+    'compute_hash_code',
     'OpeningBook',
+    'PositionIndex',
+    'PositionIndexBuilder',
 ]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from game import Oware
+
+from .constants import COEFFICIENTS
+
+
+def compute_hash_code(board, turn):
+    """
+    Perfect hash code for an oware position. Boards are ranked by the
+    distribution of their 48 seeds and the turn is stored on bit 43,
+    thus the code always fits on a signed 64-bit integer.
+    """
+
+    code = 0x80000000000 if turn == Oware.SOUTH else 0x00
+    seeds = board[13]
+
+    for house in range(12, -1, -1):
+        if seeds >= 48: break
+        code += COEFFICIENTS[seeds][house]
+        seeds += board[house]
+
+    return code
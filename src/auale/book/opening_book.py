@@ -24,7 +24,7 @@ from game import Match
 from game import Oware
 from uci import Strength
 
-from .constants import COEFFICIENTS
+from .hashing import compute_hash_code
 
 
 class OpeningBook(object):
@@ -71,6 +71,17 @@ class OpeningBook(object):
 
         return moves
 
+    def get_move_scores(self, match):
+        """Book scores of each move on a match position"""
+
+        game = match.get_game()
+        turn = match.get_turn()
+        scores = self._get_move_scores(match)
+        offset = 0 if turn == game.SOUTH else 6
+        move_scores = dict(enumerate(scores, offset))
+
+        return move_scores
+
     def _get_move_scores(self, match):
         """Scores for the given match position"""
 
@@ -116,16 +127,8 @@ class OpeningBook(object):
     def _compute_hash_code(self, match):
         """Hash code for the current match position"""
 
-        game = match.get_game()
         turn = match.get_turn()
         board = match.get_board()
-
-        code = 0x80000000000 if turn == game.SOUTH else 0x00
-        seeds = board[13]
-
-        for house in range(12, -1, -1):
-            if seeds >= 48: break
-            code += COEFFICIENTS[seeds][house]
-            seeds += board[house]
+        code = compute_hash_code(board, turn)
 
         return code
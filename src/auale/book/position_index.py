@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import mmap
+import struct
+
+from collections import namedtuple
+from game import Oware
+from serialize import OGNSerializer
+
+from .hashing import compute_hash_code
+
+Statistics = namedtuple('Statistics', (
+    'move',     # Move played on the position
+    'games',    # Number of games where it was played
+    'south',    # Games won by south
+    'north',    # Games won by north
+    'draws',    # Games that ended in a draw
+))
+
+
+class PositionIndex(object):
+    """
+    Inverted index from positions to the games that reached them.
+
+    The index is stored as a sorted sequence of fixed-width records
+    that are memory-mapped and binary searched, so lookups do not
+    require the index to be loaded into memory.
+    """
+
+    SIGNATURE = b'Auale Position Index 1.0\n'
+    RECORD = struct.Struct('>qIHBb')
+
+    NULL_MOVE = 0xFF
+    UNKNOWN = 2
+
+    def __init__(self, path):
+        self._file = None
+        self._data = None
+        self._header = dict()
+        self._offset = 0
+        self._length = 0
+        self._load_position_index(path)
+
+    def get_header(self):
+        """Header fields of the index file"""
+
+        return dict(self._header)
+
+    def get_length(self):
+        """Number of indexed positions"""
+
+        return self._length
+
+    def find_games(self, match):
+        """Game identifiers and plies that reached the position"""
+
+        games = []
+
+        for record in self._find_records(match):
+            code, game, ply, move, result = record
+            games.append((game, ply))
+
+        return tuple(games)
+
+    def find_statistics(self, match):
+        """Statistics for each move played on the position"""
+
+        moves = dict()
+
+        for record in self._find_records(match):
+            code, game, ply, move, result = record
+
+            if move != self.NULL_MOVE:
+                counts = moves.setdefault(move, [0, 0, 0, 0])
+                counts[0] += 1
+
+                if result == Oware.SOUTH:
+                    counts[1] += 1
+                elif result == Oware.NORTH:
+                    counts[2] += 1
+                elif result == Oware.DRAW:
+                    counts[3] += 1
+
+        statistics = (Statistics(m, *c) for m, c in moves.items())
+        ordered = sorted(statistics, key=lambda s: -s.games)
+
+        return tuple(ordered)
+
+    def close(self):
+        """Releases the mapped index file"""
+
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _find_records(self, match):
+        """Records that match the current position of a match"""
+
+        turn = match.get_turn()
+        board = match.get_board()
+        code = compute_hash_code(board, turn)
+        index = self._bisect(code)
+
+        while index < self._length:
+            record = self._read_record(index)
+            if record[0] != code: break
+            yield record
+            index += 1
+
+    def _bisect(self, code):
+        """Index of the first record with a hash not below code"""
+
+        low, high = 0, self._length
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self._read_code(middle) < code:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _read_code(self, index):
+        """Reads the hash code of a record"""
+
+        offset = self._offset + index * self.RECORD.size
+        code, = struct.unpack_from('>q', self._data, offset)
+
+        return code
+
+    def _read_record(self, index):
+        """Reads a record given its index"""
+
+        offset = self._offset + index * self.RECORD.size
+        record = self.RECORD.unpack_from(self._data, offset)
+
+        return record
+
+    def _load_position_index(self, path):
+        """Maps an index file into memory"""
+
+        file = open(path, 'rb')
+
+        try:
+            header = self._read_header(file)
+            offset = file.tell()
+            size = file.seek(0, 2) - offset
+            length = size // self.RECORD.size
+
+            if length > 0:
+                access = mmap.ACCESS_READ
+                self._data = mmap.mmap(file.fileno(), 0, access=access)
+        except BaseException:
+            file.close()
+            raise
+
+        self._file = file
+        self._header = header
+        self._offset = offset
+        self._length = length
+
+    def _read_header(self, file):
+        """Reads the header fields from an open file"""
+
+        header = dict()
+        signature = file.readline()
+
+        if signature != self.SIGNATURE:
+            raise ValueError('Not a valid position index')
+
+        while True:
+            field = file.readline()
+            if not field or field == b'\x00\n': break
+            values = field.decode('utf-8').strip().split(':', 1)
+            header.setdefault(*(v.strip() for v in values))
+
+        return header
+
+
+class PositionIndexBuilder(object):
+    """
+    Builds a position index from oware matches. Each added match is
+    given an identifier equal to the number of matches added before.
+    """
+
+    def __init__(self):
+        self._records = []
+        self._sources = []
+        self._serializer = OGNSerializer()
+
+    def get_sources(self):
+        """Sources of the added matches in identifier order"""
+
+        return tuple(self._sources)
+
+    def add_file(self, path):
+        """Adds a match from an OGN file"""
+
+        with open(path, 'r', encoding='utf-8') as file:
+            match = self._serializer.load(file)
+
+        return self.add_match(match, path)
+
+    def add_match(self, match, source=None):
+        """Adds all the positions of a match to the index"""
+
+        game = len(self._sources)
+        result = self._get_result(match)
+        board, turn = match.get_positions()[0]
+        moves = match.get_moves()
+
+        for ply, move in enumerate(moves):
+            code = compute_hash_code(board, turn)
+            self._records.append((code, game, ply, move, result))
+            board = Oware.make_move(board, move)
+            turn = -turn
+
+        code = compute_hash_code(board, turn)
+        move = PositionIndex.NULL_MOVE
+        self._records.append((code, game, len(moves), move, result))
+        self._sources.append(source)
+
+        return game
+
+    def save(self, path):
+        """Writes the sorted index to a file"""
+
+        record = PositionIndex.RECORD
+        self._records.sort()
+
+        with open(path, 'wb') as file:
+            file.write(PositionIndex.SIGNATURE)
+            file.write(f'Games: { len(self._sources) }\n'.encode('utf-8'))
+            file.write(f'Positions: { len(self._records) }\n'.encode('utf-8'))
+            file.write(b'\x00\n')
+
+            for values in self._records:
+                file.write(record.pack(*values))
+
+    def _get_result(self, match):
+        """Winner of a match according to its result tag"""
+
+        result = PositionIndex.UNKNOWN
+        value = match.get_tag('Result')
+
+        try:
+            south, north = (int(v) for v in value.split('-'))
+            result = (south > north) - (south < north)
+        except (AttributeError, ValueError):
+            pass
+
+        return result
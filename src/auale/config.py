@@ -44,6 +44,7 @@ ACTION_DESCRIPTORS = (
         ('simple',          ('open', 's',)),
         ('simple',          ('quit',)),
         ('simple',          ('fullscreen', 'b')),
+        ('simple',          ('trace', 's')),
         ('state',           ('engine', '"[default]"', 's')),
     )),
     ('win', (
@@ -87,6 +88,7 @@ OPTION_DESCRIPTORS = (
     ('version',             ('Show program\'s version number and exit',)),
     ('engine',              ('Set the engine to use', 'command', '&s')),
     ('fullscreen',          ('Start in fullscreen mode',)),
+    ('trace',               ('Trace the engine protocol', 'directory', '&s')),
 )
 
 # =============================================================================
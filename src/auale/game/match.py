@@ -45,6 +45,7 @@ class Match(object):
         self._endgame_flag = [False]
         self._repetition_flag = [False]
         self._current_index = 0
+        self._generation = 0
         self._tags = {}
         self._new_match()
 
@@ -70,6 +71,11 @@ class Match(object):
 
         return len(self._moves)
 
+    def get_generation(self):
+        """Number of changes made to the contents of the match"""
+
+        return self._generation
+
     def get_current_index(self):
         """Return the index of the current move"""
 
@@ -100,6 +106,14 @@ class Match(object):
 
         return tuple(self._positions)
 
+    def get_position(self, index=None):
+        """Returns the board and turn of a position"""
+
+        i = self._current_index if index is None else index
+        position = self._positions[i]
+
+        return position
+
     def get_south_store(self):
         """Returns the current south store"""
 
@@ -226,7 +240,9 @@ class Match(object):
     def set_comment(self, comment):
         """Adds a comment to the current move"""
 
-        self._comments[self._current_index] = comment
+        if self._comments[self._current_index] != comment:
+            self._comments[self._current_index] = comment
+            self._generation += 1
 
     def set_position(self, board, turn):
         """Sets a new position and initialitzes match properties"""
@@ -241,6 +257,7 @@ class Match(object):
         self._endgame_flag = [False]
         self._repetition_flag = [False]
         self._current_index = 0
+        self._generation += 1
 
         # Fill default tags
 
@@ -291,6 +308,7 @@ class Match(object):
         self._repetition_flag.append(is_repetition)
         self._positions.append((self._board[:], self._turn))
         self._current_index += 1
+        self._generation += 1
 
     def undo_last_move(self):
         """Undoes the last move"""
@@ -328,6 +346,7 @@ class Match(object):
         """Clears all the match tags"""
 
         self._tags.clear()
+        self._generation += 1
 
         for tag in self.__TAG_ROSTER:
             self._tags[tag] = '?'
@@ -373,21 +392,35 @@ class Match(object):
         if not isinstance(value, str):
             raise ValueError("Tag value must be a string")
 
-        self._tags[name.strip()] = value.strip()
+        name = name.strip()
+        value = value.strip()
+
+        if self._tags.get(name) != value:
+            self._tags[name] = value
+            self._generation += 1
 
     def set_tags(self, tags):
         """Sets the tags from the given tuple"""
 
+        previous_tags = dict(self._tags)
+        generation = self._generation
         self.reset_tags()
 
         for name, value in tags:
             self.set_tag(name, value)
 
+        if self._tags == previous_tags:
+            self._generation = generation
+
     def get_notation(self):
         """Converts this match to a valid notation tuple"""
 
+        return tuple(self.iter_notation())
+
+    def iter_notation(self):
+        """Yields the notation tokens of this match one by one"""
+
         count = 1.0
-        tokens = []
         board, turn = self._positions[0]
 
         for i in range(len(self._moves)):
@@ -398,7 +431,7 @@ class Match(object):
             captures = ''
 
             if count == number:
-                tokens.append('%d.' % number)
+                yield '%d.' % number
 
             if next_turn == self._game.NORTH:
                 if board[12] != next_board[12]:
@@ -409,20 +442,18 @@ class Match(object):
                     next_board[13] - board[13])
 
             alpha = self._game.to_move_notation(move)
-            tokens.append('%s%s' % (alpha, captures))
+            yield '%s%s' % (alpha, captures)
 
             if comment is not None:
-                tokens.append('{')
-                tokens.extend(comment.split())
-                tokens.append('}')
+                yield '{'
+                yield from comment.split()
+                yield '}'
 
             board = next_board
             count += 0.5
 
         if self._tags['Result'] != '*':
-            tokens.append(self._tags['Result'])
-
-        return tuple(tokens)
+            yield self._tags['Result']
 
     def __hash__(self):
         """Computes a hash for this object"""
@@ -40,6 +40,7 @@ gi.require_version('Gdk', '3.0')
 gi.require_version('Gtk', '3.0')
 gi.require_version('Rsvg', '2.0')
 gi.require_version('Clutter', '1.0')
+gi.require_version('Cogl', '1.0')
 gi.require_version('GtkClutter', '1.0')
 gi.require_version('Manette', '0.2')
 
@@ -22,6 +22,7 @@ from gi.repository import Clutter
 from gi.repository import Gio
 from gi.repository import GObject
 from gi.repository import Rsvg
+from .surface_cache import SurfaceCache
 
 
 class Glyph(Clutter.Canvas):
@@ -29,13 +30,13 @@ class Glyph(Clutter.Canvas):
 
     __gtype_name__ = 'Glyph'
     __cache = dict()
+    __surfaces = SurfaceCache(64 * 1024 * 1024)
 
     def __init__(self):
         super(Glyph, self).__init__()
 
         self._path = None
         self._handle = None
-        self._surface = None
         self._fragment = None
 
         self.connect('draw', self.on_draw_request)
@@ -55,7 +56,6 @@ class Glyph(Clutter.Canvas):
 
         self._path = path
         self._handle = None
-        self._surface = None
         self.invalidate()
 
     def set_fragment(self, fragment):
@@ -72,7 +72,14 @@ class Glyph(Clutter.Canvas):
     def get_image_surface(self):
         """Obtain the current Cairo image surface"""
 
-        return self._surface or self._create_image_surface()
+        key = self._get_surface_key()
+        surface = self.__surfaces.lookup(key)
+
+        if surface is None:
+            surface = self._create_image_surface()
+            self.__surfaces.store(key, surface)
+
+        return surface
 
     def on_draw_request(self, canvas, context, width, height):
         """Draws the loaded glyph on the canvas"""
@@ -82,6 +89,22 @@ class Glyph(Clutter.Canvas):
             context.set_source_surface(surface)
             context.paint()
 
+    def _get_scale_factor(self):
+        """Device pixels per unit of the surfaces to draw"""
+
+        factor = self.get_property('scale-factor')
+
+        return max(1, factor)
+
+    def _get_surface_key(self):
+        """Identifies the surface drawn by this glyph"""
+
+        width = int(self.get_property('width'))
+        height = int(self.get_property('height'))
+        factor = self._get_scale_factor()
+
+        return (self._path, self._fragment, width, height, factor)
+
     def _create_image_surface(self):
         """Creates a surface for the current .svg fragment"""
 
@@ -89,10 +112,13 @@ class Glyph(Clutter.Canvas):
         view_size = handle.get_dimensions()
         width = int(self.get_property('width'))
         height = int(self.get_property('height'))
+        factor = self._get_scale_factor()
         x = (width / 2.0) - (view_size.width / 2.0)
         y = (height / 2.0) - (view_size.height / 2.0)
 
-        surface = cairo.ImageSurface(cairo.Format.ARGB32, width, height)
+        format = cairo.Format.ARGB32
+        surface = cairo.ImageSurface(format, width * factor, height * factor)
+        surface.set_device_scale(factor, factor)
         context = cairo.Context(surface)
         context.translate(x, y)
         handle.render_cairo_sub(context, self._fragment)
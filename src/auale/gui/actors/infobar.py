@@ -173,9 +173,9 @@ class Infobar(Actor):
     def _get_principal_variation(self, report):
         """Extracts the principal variation from an engine report"""
 
-        move = report.get('ponder') or ''
-        variation = report.get('pv') or ''
-        n = int(report.get('number'))
+        move = report.ponder or ''
+        variation = report.pv or ''
+        n = report.number
 
         moves = '{:s}{:s}'.format(move, variation)
         moves = '…{:s}'.format(moves) if moves[0:1].islower() else moves
@@ -187,8 +187,8 @@ class Infobar(Actor):
     def _get_variation_score(self, report):
         """Extracts the score from an engine report"""
 
-        score = report.get('cp') or '0'
-        value = int(score) / 100
+        score = report.cp or 0
+        value = score / 100
         result = '{:+.2f} {:s}'.format(value, _('seeds'))
 
         return result
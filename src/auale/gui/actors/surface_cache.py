@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from collections import OrderedDict
+
+
+class SurfaceCache(object):
+    """
+    Least recently used cache of rendered Cairo surfaces. The cache is
+    bounded by the memory taken by the pixels of its surfaces; when a
+    new surface exceeds that budget the least recently used ones are
+    dropped until it fits again.
+    """
+
+    def __init__(self, budget):
+        self._budget = budget
+        self._usage = 0
+        self._surfaces = OrderedDict()
+
+    def get_budget(self):
+        """Maximum number of bytes of pixel data to keep"""
+
+        return self._budget
+
+    def set_budget(self, budget):
+        """Sets the maximum number of bytes of pixel data to keep"""
+
+        self._budget = max(0, budget)
+        self._evict_surfaces()
+
+    def get_usage(self):
+        """Number of bytes of pixel data currently kept"""
+
+        return self._usage
+
+    def lookup(self, key):
+        """Surface stored for a key or none"""
+
+        surface = self._surfaces.get(key)
+
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+
+        return surface
+
+    def store(self, key, surface):
+        """Stores a surface evicting the least recently used ones"""
+
+        if key in self._surfaces:
+            self._usage -= self._get_size(self._surfaces[key])
+
+        self._surfaces[key] = surface
+        self._surfaces.move_to_end(key)
+        self._usage += self._get_size(surface)
+        self._evict_surfaces()
+
+    def clear(self):
+        """Removes all the surfaces from the cache"""
+
+        self._surfaces.clear()
+        self._usage = 0
+
+    def _get_size(self, surface):
+        """Bytes taken by the pixels of an image surface"""
+
+        return surface.get_stride() * surface.get_height()
+
+    def _evict_surfaces(self):
+        """Removes the least recently used surfaces above the budget"""
+
+        while self._usage > self._budget and self._surfaces:
+            key, surface = self._surfaces.popitem(last=False)
+            self._usage -= self._get_size(surface)
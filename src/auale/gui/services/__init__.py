@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 
+from .engine_pool import EnginePool
 from .game_loop import GameLoop
 from .match_manager import MatchManager
 from .player_manager import PlayerManager
 from .ponder_cache import PonderCache
+from .result_cache import ResultCache
+from .speculator import Speculator
 
 __all__ = [
+    'EnginePool',
     'GameLoop',
     'MatchManager',
     'PlayerManager',
-    'PonderCache'
+    'PonderCache',
+    'ResultCache',
+    'Speculator'
 ]
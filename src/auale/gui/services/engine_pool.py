@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from concurrent.futures import wait
+from threading import RLock
+from threading import Thread
+from gi.repository import GLib
+from gi.repository import GObject
+from uci import Engine
+from uci import LocalEngine
+
+
+class EnginePool(GObject.GObject):
+    """
+    Service that keeps warm engine processes ready to be leased. Engines
+    are reset when released so they can be reused by other windows, and
+    leased engines are periodically checked and respawned if they crash.
+    Engines are started on worker threads, and the pool signals are
+    always emitted on the main loop.
+    """
+
+    __gtype_name__ = 'EnginePool'
+    __default_pool = None
+    __health_interval = 2000
+    __max_failures = 3
+    __quit_timeout = 8.0
+
+    def __init__(self, size=2):
+        GObject.GObject.__init__(self)
+
+        self._size = size
+        self._idle = dict()
+        self._leased = set()
+        self._recycling = set()
+        self._failures = dict()
+        self._spawning = dict()
+        self._is_closed = False
+        self._health_source = None
+        self._pool_lock = RLock()
+        self._logger = logging.getLogger('uci')
+
+    @GObject.Signal
+    def engine_replaced(self, engine: object, replacement: object):
+        """Emitted when a crashed leased engine was respawned"""
+
+    @GObject.Signal
+    def engine_lost(self, engine: object):
+        """Emitted when a crashed leased engine could not be respawned"""
+
+    @staticmethod
+    def get_default():
+        """Shared engine pool of the application"""
+
+        if EnginePool.__default_pool is None:
+            EnginePool.__default_pool = EnginePool()
+
+        return EnginePool.__default_pool
+
+    def get_size(self):
+        """Number of idle engines kept warm for each command"""
+
+        return self._size
+
+    def set_size(self, size):
+        """Sets how many idle engines are kept for each command"""
+
+        self._size = max(0, size)
+
+    def prespawn(self, command):
+        """Starts idle engines for a command in the background"""
+
+        with self._pool_lock:
+            command = tuple(command)
+            idle = self._idle.setdefault(command, [])
+            idle[:] = [e for e in idle if e.is_healthy()]
+            spawning = self._spawning.get(command, 0)
+            count = self._size - len(idle) - spawning
+
+            if self._is_closed or count < 1:
+                return
+
+            self._spawning[command] = spawning + count
+
+        worker = Thread(target=self._spawn_engines, args=(command, count))
+        worker.daemon = True
+        worker.start()
+
+    def lease(self, command):
+        """Leases a warm engine for a command, starting one if needed"""
+
+        command = tuple(command)
+
+        with self._pool_lock:
+            engine = self._pop_idle_engine(command)
+
+        if engine is None:
+            engine = self._create_engine(command)
+
+        with self._pool_lock:
+            self._leased.add(engine)
+            self._start_health_checks()
+
+        self.prespawn(command)
+
+        return engine
+
+    def borrow(self, command):
+        """Leases an idle engine for a command only if one is warm"""
+
+        with self._pool_lock:
+            command = tuple(command)
+            engine = self._pop_idle_engine(command)
+
+            if engine is not None:
+                self._leased.add(engine)
+                self._start_health_checks()
+
+        if engine is not None:
+            self.prespawn(command)
+
+        return engine
+
+    def release(self, engine):
+        """Returns a leased engine to the pool without blocking"""
+
+        with self._pool_lock:
+            if engine not in self._leased:
+                return
+
+            self._leased.discard(engine)
+            self._recycling.add(engine)
+
+        worker = Thread(target=self._recycle_engine, args=(engine,))
+        worker.daemon = True
+        worker.start()
+
+    def respawn(self, engine):
+        """Replaces a leased engine with a new one in the background"""
+
+        with self._pool_lock:
+            if engine not in self._leased:
+                return
+
+            self._leased.discard(engine)
+
+        worker = Thread(target=self._respawn_engine, args=(engine,))
+        worker.daemon = True
+        worker.start()
+
+    def quit_engines(self):
+        """Quits all the idle and leased engines"""
+
+        futures = []
+
+        with self._pool_lock:
+            self._is_closed = True
+
+            for idle in self._idle.values():
+                for engine in idle:
+                    futures.append(engine.quit())
+
+            for engine in self._leased | self._recycling:
+                futures.append(engine.quit())
+
+            self._idle.clear()
+            self._leased.clear()
+            self._recycling.clear()
+
+        wait(futures, self.__quit_timeout)
+
+    def _spawn_engines(self, command, count):
+        """Starts idle engines for a command on a worker thread"""
+
+        for index in range(count):
+            engine = None
+
+            try:
+                engine = self._create_engine(command)
+            except BaseException:
+                self._logger.warning('Could not prespawn engines')
+
+            with self._pool_lock:
+                self._spawning[command] -= 1
+                idle = self._idle.setdefault(command, [])
+                is_kept = not self._is_closed and len(idle) < self._size
+
+                if engine is not None and is_kept:
+                    idle.append(engine)
+                    engine = None
+
+            if engine is not None:
+                self._terminate_engine(engine)
+
+    def _respawn_engine(self, engine):
+        """Replaces a crashed engine on a worker thread"""
+
+        replacement = None
+        self._terminate_engine(engine)
+        command = engine.get_command()
+
+        with self._pool_lock:
+            failures = 1 + self._failures.get(command, 0)
+            self._failures[command] = failures
+
+        try:
+            if failures <= self.__max_failures:
+                replacement = self._create_engine(command)
+        except BaseException as error:
+            self._logger.warning('Could not respawn engine')
+
+        with self._pool_lock:
+            if replacement is not None and self._is_closed:
+                self._terminate_engine(replacement)
+                replacement = None
+            elif replacement is not None:
+                self._leased.add(replacement)
+                self._start_health_checks()
+
+        GLib.idle_add(self._emit_respawn, engine, replacement)
+
+    def _emit_respawn(self, engine, replacement):
+        """Notifies on the main loop the result of a respawn"""
+
+        if replacement is None:
+            self.engine_lost.emit(engine)
+        else:
+            self.engine_replaced.emit(engine, replacement)
+
+        return GLib.SOURCE_REMOVE
+
+    def _recycle_engine(self, engine):
+        """Resets a released engine and keeps it if there is room"""
+
+        command = engine.get_command()
+        is_reset = engine.is_healthy() and engine.reset()
+
+        with self._pool_lock:
+            if engine not in self._recycling:
+                return
+
+            self._recycling.discard(engine)
+            idle = self._idle.setdefault(command, [])
+            is_reusable = is_reset and len(idle) < self._size
+
+            if is_reusable is True:
+                self._failures.pop(command, None)
+                idle.append(engine)
+
+        if not is_reusable:
+            engine.quit()
+
+    def _pop_idle_engine(self, command):
+        """Pops a healthy idle engine for a command if any"""
+
+        idle = self._idle.get(command, [])
+
+        while idle:
+            engine = idle.pop()
+
+            if engine.is_healthy():
+                return engine
+
+            self._terminate_engine(engine)
+
+    def _create_engine(self, command):
+        """Starts a new engine process"""
+
+        self._logger.debug(f'Spawning engine: { command }')
+
+        if command == LocalEngine.COMMAND:
+            return LocalEngine(command)
+
+        return Engine(command)
+
+    def _terminate_engine(self, engine):
+        """Ensures a discarded engine is not running"""
+
+        try:
+            engine.quit() if engine.is_healthy() else engine.terminate()
+        except BaseException:
+            self._logger.warning('Could not quit engine')
+
+    def _start_health_checks(self):
+        """Schedules the periodic health checks of leased engines"""
+
+        if self._health_source is None:
+            interval = self.__health_interval
+            callback = self._check_engines_health
+            self._health_source = GLib.timeout_add(interval, callback)
+
+    def _check_engines_health(self):
+        """Respawns any leased engine that is not running"""
+
+        with self._pool_lock:
+            crashed = [e for e in self._leased if not e.is_healthy()]
+            is_leasing = bool(self._leased)
+
+            if not is_leasing:
+                self._health_source = None
+
+        for engine in crashed:
+            self._logger.warning(f'Engine crashed: { engine }')
+            self.respawn(engine)
+
+        return GLib.SOURCE_CONTINUE if is_leasing else GLib.SOURCE_REMOVE
@@ -17,29 +17,52 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import math
 
 from threading import RLock
 from gi.repository import GLib
 from gi.repository import GObject
 from game import Match
 from uci import Engine
+from uci import RankedReports
 from .ponder_cache import PonderCache
+from .report_channel import ReportChannel
+from .result_cache import ResultCache
+from .speculator import Speculator
 
 
 class GameLoop(GObject.GObject):
-    """Represents the game loop"""
+    """
+    Represents the game loop. Each move request is identified by an
+    increasing token and answers are only emitted on the main loop if
+    their token is still the current one; thus, replies that arrive
+    after a request was superseded or aborted are dropped and engine
+    threads never wait for the loop.
+    """
 
     __gtype_name__ = 'GameLoop'
     __move_delay = 1.6
+    __stages = ('forced', 'book', 'cache', 'speculation', 'engine')
 
     def __init__(self):
         GObject.GObject.__init__(self)
 
         self._active_player = None
+        self._request_token = 0
+        self._promoted_token = None
         self._current_player = None
         self._previous_player = None
         self._request_lock = RLock()
-        self._ponder_cache = PonderCache(256)
+        self._ponder_cache = self._create_ponder_cache()
+        self._result_cache = ResultCache(1024, 3600)
+        self._opening_book = None
+        self._stage_counters = dict.fromkeys(self.__stages, 0)
+        self._report_channel = ReportChannel(self.info_received.emit)
+        self._ranking_channel = ReportChannel(self.ranking_received.emit)
+        self._rankings = dict()
+        self._report_tokens = dict()
+        self._speculator = Speculator(
+            self._on_speculative_move, self._on_speculative_info)
         self._logger = logging.getLogger('game-loop')
 
     @GObject.Signal
@@ -50,6 +73,10 @@ class GameLoop(GObject.GObject):
     def info_received(self, player: object, values: object):
         """Emitted when a player wants to send a search report"""
 
+    @GObject.Signal
+    def ranking_received(self, player: object, ranking: object):
+        """Emitted with the latest report of each MultiPV rank"""
+
     def request_move(self, player, match):
         """Requests a player to make a move"""
 
@@ -59,6 +86,7 @@ class GameLoop(GObject.GObject):
         self._logger.debug('Received a move request')
 
         with self._request_lock:
+            self._request_token += 1
             self._active_player = None
 
             if self._is_entering_player(player):
@@ -76,7 +104,7 @@ class GameLoop(GObject.GObject):
                 self._switch_to_pondering(self._previous_player, match)
 
             self._switch_to_waiting(self._current_player)
-            self._switch_to_thinking(self._current_player, match)
+            self._switch_to_searching(self._current_player, match)
 
         self._logger.debug('Move requested for player')
 
@@ -86,12 +114,75 @@ class GameLoop(GObject.GObject):
         self._logger.debug('Received a move abortion request')
 
         with self._request_lock:
+            self._request_token += 1
             self._active_player = None
+            self._speculator.cancel()
+            self._report_channel.clear()
+            self._ranking_channel.clear()
             self._switch_to_waiting(self._current_player)
             self._switch_to_waiting(self._previous_player)
 
         self._logger.debug('Current move request was aborted')
 
+    def set_speculation_width(self, width):
+        """Number of likely replies to search on idle engines"""
+
+        self._speculator.set_width(width)
+
+    def set_opening_book(self, book):
+        """Opening book used to answer engine requests or none"""
+
+        self._opening_book = book
+
+    def set_result_cache_limits(self, size, ttl):
+        """Maximum entries and seconds to keep engine results"""
+
+        self._result_cache.set_size(size)
+        self._result_cache.set_ttl(ttl)
+
+    def get_ranking(self, player):
+        """Latest report of each rank searched by a player"""
+
+        rankings = self._rankings.get(player)
+        ranking = rankings.get_ranking() if rankings else ()
+
+        return ranking
+
+    def get_report_counters(self):
+        """Counters of the reports coalesced by this loop"""
+
+        return self._report_channel.counters
+
+    def get_stage_counters(self):
+        """Number of move requests answered by each stage"""
+
+        return dict(self._stage_counters)
+
+    def disconnect_players(self):
+        """Aborts any move request and forgets the players"""
+
+        with self._request_lock:
+            self.abort_move()
+            self._disconnect_player(self._current_player)
+
+            if self._previous_player != self._current_player:
+                self._disconnect_player(self._previous_player)
+
+            self._current_player = None
+            self._previous_player = None
+
+        counters = self._report_channel.counters
+        self._logger.debug(f'Report counters: { counters }')
+        self._ponder_cache.close()
+
+    def _create_ponder_cache(self):
+        """Ponder cache backed by the user's cache directory"""
+
+        path = PonderCache.get_default_path()
+        cache = PonderCache(4096, path)
+
+        return cache
+
     def _is_entering_player(self, player):
         """Checks if its a new player entering the match"""
 
@@ -112,6 +203,7 @@ class GameLoop(GObject.GObject):
         """Connects a player to the signal handlers"""
 
         if isinstance(player, Engine):
+            self._rankings[player] = RankedReports()
             player.connect('move-received', self._on_move_received)
             player.connect('info-received', self._on_info_received)
 
@@ -121,6 +213,8 @@ class GameLoop(GObject.GObject):
         if isinstance(player, Engine):
             player.disconnect_by_func(self._on_info_received)
             player.disconnect_by_func(self._on_move_received)
+            self._rankings.pop(player, None)
+            self._report_tokens.pop(player, None)
 
     def _switch_to_waiting(self, player):
         """Switches a player state to waiting for a command"""
@@ -128,13 +222,40 @@ class GameLoop(GObject.GObject):
         if isinstance(player, Engine):
             player.stop_thinking()
 
+    def _switch_to_searching(self, player, match):
+        """Answers a request from the first stage that has a move"""
+
+        if not isinstance(player, Engine):
+            return
+
+        stages = (
+            ('forced', self._answer_forced_move),
+            ('book', self._answer_from_book),
+            ('cache', self._answer_from_cache),
+            ('speculation', self._promote_speculation)
+        )
+
+        for stage, answer in stages:
+            if answer(player, match) is True:
+                break
+        else:
+            stage = 'engine'
+            self._switch_to_thinking(player, match)
+
+        if stage != 'speculation':
+            self._speculator.cancel()
+
+        self._stage_counters[stage] += 1
+        self._logger.debug(f'Move request answered by { stage }')
+
     def _switch_to_thinking(self, player, match):
         """Switches a player state to searching for a move"""
 
         if isinstance(player, Engine):
             self._active_player = player
+            self._clear_ranking(player, self._request_token)
             player.start_new_match(match)
-            player.start_thinking(match)
+            player.start_thinking(match, self._request_token)
 
     def _switch_to_pondering(self, player, match):
         """Switches a player state to pondering a position"""
@@ -144,39 +265,246 @@ class GameLoop(GObject.GObject):
 
             if strength.allows_pondering:
                 move = self._ponder_cache.fetch(match)
+                self._clear_ranking(player, None)
                 player.start_new_match(match)
                 player.start_pondering(match, move)
+                replies = self._get_likely_replies(match, move)
+                self._speculator.start(player, match, replies)
+
+    def _answer_forced_move(self, player, match):
+        """Answers a move request if only one move is legal"""
+
+        moves = match.get_legal_moves()
+        is_forced = len(moves) == 1
+
+        if is_forced is True:
+            self._active_player = player
+            self._clear_ranking(player, self._request_token)
+            self._post_answer(self._request_token, player, moves[0])
+
+        return is_forced
+
+    def _answer_from_book(self, player, match):
+        """Answers a move request from the opening book if any"""
+
+        if self._opening_book is None:
+            return False
+
+        strength = player.get_playing_strength()
+        self._opening_book.set_strength(strength)
+        move = self._opening_book.pick_best_move(match)
+
+        if move is not None:
+            self._active_player = player
+            self._clear_ranking(player, self._request_token)
+            self._post_answer(self._request_token, player, move)
+
+        return move is not None
+
+    def _answer_from_cache(self, player, match):
+        """Answers a move request with a cached search result if any"""
+
+        values = self._result_cache.lookup(player, match)
+
+        if values is not None:
+            game = match.get_game()
+            move = game.to_move(values.move)
+            self._active_player = player
+            self._clear_ranking(player, self._request_token)
+            self._post_answer(self._request_token, player, move)
+
+        return values is not None
+
+    def _promote_speculation(self, player, match):
+        """Answers a move request with a speculative search if any"""
+
+        self._active_player = player
+        self._promoted_token = self._request_token
+        self._clear_ranking(player, self._request_token)
+        is_promoted = self._speculator.promote(match)
+
+        if is_promoted is not True:
+            self._active_player = None
+
+        return is_promoted
+
+    def _post_answer(self, token, player, move):
+        """Emits the answer to a request on the main loop"""
+
+        GLib.idle_add(self._emit_answer, token, player, move)
+
+    def _post_search_result(self, token, player, match, values):
+        """Handles the result of a search on the main loop"""
+
+        args = (token, player, match, values)
+        GLib.idle_add(self._emit_search_result, *args)
+
+    def _is_current_request(self, token, player):
+        """Checks if a player's answer is for the current request"""
+
+        is_current = token == self._request_token
+        is_active = player is not None and player == self._active_player
+
+        return is_current and is_active
+
+    def _is_current_report(self, player, values):
+        """Checks if a report is for the search a player is ranking"""
+
+        token = self._report_tokens.get(player)
+        is_current = values.request == token
+
+        return is_current
+
+    def _on_speculative_move(self, match, values):
+        """Handles the best move of a promoted speculative search"""
+
+        token = self._promoted_token
+        player = self._active_player
+        self._post_search_result(token, player, match, values)
+
+    def _on_speculative_info(self, values):
+        """Handles a report of a promoted speculative search"""
+
+        player = self._active_player
+        is_current = self._promoted_token == self._request_token
+
+        if player is not None and is_current:
+            self._emit_player_report(player, values)
 
     def _on_move_received(self, player, values):
         """Handles the reception of an engine move"""
 
-        if player == self._active_player:
-            with self._request_lock:
-                self._active_player = None
-                self._emit_player_move(player, values)
+        if values.request is not None:
+            match = player.get_current_match()
+            self._post_search_result(values.request, player, match, values)
 
         self._logger.debug('Move received from engine')
 
     def _on_info_received(self, player, values):
         """Handles the reception of an engine report"""
 
+        if not self._is_current_report(player, values):
+            self._logger.debug('Dropped a stale engine report')
+            return
+
         self._emit_player_report(player, values)
         self._logger.debug('Information received from engine')
 
-    def _emit_player_move(self, player, values):
-        """Emits a move received from the given player"""
+    def _emit_answer(self, token, player, move):
+        """Emits a move unless its request is not current anymore"""
+
+        with self._request_lock:
+            if not self._is_current_request(token, player):
+                self._logger.debug('Dropped a stale move')
+                return
+
+            self._active_player = None
+            self.move_received.emit(player, move)
+
+    def _emit_search_result(self, token, player, match, values):
+        """Stores a search result and emits its move if current"""
+
+        with self._request_lock:
+            if not self._is_current_request(token, player):
+                self._logger.debug('Dropped a stale search result')
+                return
+
+            self._active_player = None
+            self._store_search_result(player, match, values)
+            move = self._store_player_move(player, match, values)
+            self.move_received.emit(player, move)
+
+    def _store_search_result(self, player, match, values):
+        """Caches a search result unless it was an engine book move"""
+
+        if self._get_ranked_report(player) is not None:
+            self._result_cache.store(player, match, values)
+
+    def _store_player_move(self, player, match, values):
+        """Stores a search result on the ponder cache"""
 
-        match = player.get_current_match()
         game = match.get_game()
-        move = game.to_move(values['move'])
+        move = game.to_move(values.move)
+        report = self._get_ranked_report(player)
+        value = score = depth = None
+
+        if values.ponder is not None:
+            value = game.to_move(values.ponder)
 
-        if values['ponder'] is not None:
-            value = game.to_move(values['ponder'])
-            self._ponder_cache.store(match, move, value)
+        if report is not None:
+            score = report.cp
+            depth = report.depth
 
-        GLib.idle_add(self.move_received.emit, player, move)
+        self._ponder_cache.store(match, move, value, score, depth)
+
+        return move
 
     def _emit_player_report(self, player, values):
         """Emits a report received from the given player"""
 
-        GLib.idle_add(self.info_received.emit, player, values)
+        rankings = self._rankings.get(player)
+
+        if values.multipv is None or values.multipv == 1:
+            self._report_channel.post(player, values)
+
+        if rankings is not None and rankings.update(values):
+            if player.get_multipv() > 1:
+                ranking = rankings.get_ranking()
+                self._ranking_channel.post(player, ranking)
+
+    def _get_likely_replies(self, match, exclude=None):
+        """
+        Legal moves on a match sorted from the most to the least likely
+        to be played. A move remembered on the ponder cache comes first,
+        then moves by their opening book score and captures before the
+        rest of the moves.
+        """
+
+        board = match.get_board()
+        turn = match.get_turn()
+        entry = self._ponder_cache.lookup(board, turn)
+        remembered = entry and entry.move
+        book_scores = self._get_book_scores(match)
+        moves = [m for m in match.get_legal_moves() if m != exclude]
+
+        def likelihood(move):
+            is_remembered = move == remembered
+            book_score = book_scores.get(move, -math.inf)
+            is_capture = match.is_capture_move(move)
+            return (is_remembered, book_score, is_capture)
+
+        replies = sorted(moves, key=likelihood, reverse=True)
+
+        return replies
+
+    def _get_book_scores(self, match):
+        """Opening book scores of the moves on a match position"""
+
+        if self._opening_book is None:
+            return dict()
+
+        return self._opening_book.get_move_scores(match)
+
+    def _get_ranked_report(self, player):
+        """Latest main line report of a player's search or none"""
+
+        report = None
+        rankings = self._rankings.get(player)
+
+        if rankings is not None:
+            report = rankings.get_report(1)
+
+        return report
+
+    def _clear_ranking(self, player, token):
+        """
+        Forgets the ranked reports of a player's last search and only
+        accepts from now on the reports for the given request, which
+        is none while the player ponders.
+        """
+
+        rankings = self._rankings.get(player)
+        self._report_tokens[player] = token
+
+        if rankings is not None:
+            rankings.clear()
@@ -16,16 +16,26 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from threading import Thread
 from game import Match
 from game import Oware
 from gi.repository import Gio
+from gi.repository import GLib
 from gi.repository import GObject
 from gi.repository import Gtk
 from serialize import OGNSerializer
 
 
 class MatchManager(GObject.GObject):
-    """Service to manage oware match files"""
+    """
+    Service to manage oware match files. Files are read and written
+    asynchronously and parsed on a worker thread, so that large files
+    or remote locations do not block the main loop; the signals of
+    this service are always emitted on the main loop. An unload that
+    is requested while a save is pending is deferred until the save
+    completes, so that a failed save never discards the match it was
+    writing.
+    """
 
     __gtype_name__ = 'MatchManager'
 
@@ -35,7 +45,12 @@ class MatchManager(GObject.GObject):
         self._etag = None
         self._file = None
         self._match = None
-        self._hash = hash(None)
+        self._generation = None
+        self._pending_saves = 0
+        self._deferred_unload = None
+        self._loading_match = None
+        self._loading_generation = None
+        self._load_cancellable = None
         self._serializer = OGNSerializer()
         self._recent_manager = Gtk.RecentManager.get_default()
 
@@ -86,102 +101,262 @@ class MatchManager(GObject.GObject):
         return bool(self.get_file())
 
     def has_unsaved_changes(self):
-        """If the match contains unsaved changes"""
+        """If the match contains changes not saved yet"""
 
-        return self._hash != hash(self._match)
+        generation = self._get_generation(self._match)
 
-    def unload(self):
-        """Unloads the current match if any"""
+        return self._generation != generation
 
-        response = self._unload_is_not_aborted()
+    def is_saving(self):
+        """If a match file is still being written"""
+
+        return self._pending_saves > 0
+
+    def unload(self, callback=None):
+        """
+        Unloads the current match if any. Returns if the unload was
+        aborted. If it was deferred by a pending save, the callback or
+        else this method is invoked again once the save completes.
+        """
+
+        retry = callback or self.unload
+        response = self._unload_is_not_aborted(retry)
 
         if response is True:
-            self._hash = hash(None)
+            self._cancel_load()
+            self._generation = None
             self._match = None
             self._file = None
 
         return not response
 
-    def load_new_match(self):
-        """Loads a new empty match"""
+    def load_new_match(self, callback=None):
+        """
+        Loads a new empty match. If the current match could not be
+        unloaded yet because it is being saved, the callback or else
+        this method is invoked again once the save completes.
+        """
 
-        if self._unload_is_not_aborted():
+        retry = callback or self.load_new_match
+
+        if self._unload_is_not_aborted(retry):
+            self._cancel_load()
             self._etag = None
             self._file = None
             self._match = Match(Oware)
-            self._hash = hash(self._match)
+            self._generation = self._match.get_generation()
             self.file_changed.emit(self._match, True)
 
         return self._match
 
     def load_from_uri(self, uri):
-        """Loads a match from an URI into this manager"""
+        """
+        Starts loading a match from an URI into this manager. A file
+        changed signal is emitted once the match is loaded, and any
+        load started before is cancelled.
+        """
 
         try:
-            if self._unload_is_not_aborted():
-                file, etag = self._obtain_file_for_uri(uri)
-                match, etag = self._load_match_from_uri(uri)
-                self._update_match_file(file, match, etag)
+            retry = lambda: self.load_from_uri(uri)
+
+            if self._unload_is_not_aborted(retry):
+                file = Gio.File.new_for_uri(uri)
+                self._load_match_from_file(file)
         except BaseException as error:
             self.file_load_error.emit(error)
 
         return self._match
 
     def save_to_uri(self, uri):
-        """Saves the loaded match to the given file"""
+        """
+        Starts saving the loaded match to the given file. A file changed
+        signal is emitted once the match is saved.
+        """
 
         try:
             match = self._match
             file, etag = self._obtain_file_for_uri(uri)
 
             if self._overwrite_is_not_aborted(file):
-                match, etag = self._save_match_to_file(file, match)
-                self._update_match_file(file, match, etag)
+                self._save_match_to_file(file, match)
         except BaseException as error:
             self.file_save_error.emit(error)
 
         return self._match
 
-    def _load_match_from_uri(self, uri):
-        """Loads a match from the given file path"""
+    def _load_match_from_file(self, file):
+        """Reads a match file asynchronously"""
+
+        self._cancel_load()
+
+        cancellable = Gio.Cancellable()
+        callback = self._on_load_contents_ready
+        self._load_cancellable = cancellable
+        self._loading_match = self._match
+        self._loading_generation = self._get_generation(self._match)
+        file.load_contents_async(cancellable, callback, cancellable)
+
+    def _cancel_load(self):
+        """Cancels the match file being loaded if any"""
+
+        if self._load_cancellable is not None:
+            self._load_cancellable.cancel()
+            self._load_cancellable = None
+
+    def _save_match_to_file(self, file, match):
+        """Writes a match file asynchronously"""
+
+        generation = match.get_generation()
+        data = self._serializer.dumps(match).encode('utf-8')
+        contents = GLib.Bytes.new(data)
+        save_params = (None, False, Gio.FileCreateFlags.NONE, None)
+        callback = self._on_replace_contents_ready
+        app = Gio.Application.get_default()
+
+        if app is not None:
+            app.hold()
+
+        self._pending_saves += 1
+        args = (contents, *save_params, callback, match, generation, app)
+        file.replace_contents_bytes_async(*args)
+
+    def _parse_match(self, cancellable, file, contents, etag):
+        """Parses the contents of a match file on a worker thread"""
+
+        try:
+            data = contents.decode('utf-8')
+            match = self._serializer.loads(data)
+            args = (cancellable, file, match, etag)
+            GLib.idle_add(self._on_match_parsed, *args)
+        except BaseException as error:
+            args = (cancellable, error)
+            GLib.idle_add(self._on_match_parse_error, *args)
+
+    def _is_current_load(self, cancellable):
+        """If a load was not cancelled or superseded"""
+
+        is_current = cancellable is self._load_cancellable
+        is_cancelled = cancellable.is_cancelled()
+
+        return is_current and not is_cancelled
+
+    def _on_load_contents_ready(self, file, result, cancellable):
+        """Starts parsing a match file once its contents are read"""
 
-        file = Gio.File.new_for_uri(uri)
-        success, contents, etag = file.load_contents()
-        data = contents.decode('utf-8')
-        match = self._serializer.loads(data)
+        try:
+            success, contents, etag = file.load_contents_finish(result)
+        except GLib.Error as error:
+            if self._is_current_load(cancellable):
+                self._load_cancellable = None
+                self.file_load_error.emit(error)
+            return
+
+        if self._is_current_load(cancellable):
+            args = (cancellable, file, contents, etag)
+            thread = Thread(target=self._parse_match, args=args)
+            thread.daemon = True
+            thread.start()
+
+    def _on_match_parsed(self, cancellable, file, match, etag):
+        """Replaces the current match once a file is parsed"""
+
+        if self._is_current_load(cancellable):
+            self._load_cancellable = None
+            self._replace_match_file(file, match, etag)
+
+    def _on_match_parse_error(self, cancellable, error):
+        """Notifies that a match file could not be parsed"""
+
+        if self._is_current_load(cancellable):
+            self._load_cancellable = None
+            self.file_load_error.emit(error)
+
+    def _on_replace_contents_ready(self, file, result, match, gen, app):
+        """Updates the file information once a match is saved"""
+
+        if app is not None:
+            app.release()
+
+        self._pending_saves -= 1
+
+        try:
+            success, etag = file.replace_contents_finish(result)
+        except GLib.Error as error:
+            self._deferred_unload = None
+            self.file_save_error.emit(error)
+            return
+
+        if match is self._match:
+            self._update_match_file(file, match, etag, gen)
+        else:
+            self._recent_manager.add_item(file.get_uri())
+
+        if not self.is_saving():
+            self._resume_deferred_unload()
+
+    def _resume_deferred_unload(self):
+        """Retries an unload that was waiting for the saves"""
 
-        return match, etag
+        retry, self._deferred_unload = self._deferred_unload, None
 
-    def _save_match_to_file(self, file, match, etag=None):
-        """Saves a match to the given file"""
+        if retry is not None:
+            retry()
 
-        data = self._serializer.dumps(self._match).encode('utf-8')
-        save_params = (etag, False, Gio.FileCreateFlags.NONE, None)
-        success, etag = file.replace_contents(data, *save_params)
+    def _replace_match_file(self, file, match, etag):
+        """Replaces the current match with a loaded match"""
 
-        return match, etag
+        retry = lambda: self._replace_match_file(file, match, etag)
 
-    def _update_match_file(self, file, match, etag):
+        if self._replace_is_not_aborted(retry):
+            self._update_match_file(file, match, etag)
+
+    def _update_match_file(self, file, match, etag, generation=None):
         """Updates the current file information"""
 
         is_new = match != self._match
 
+        if generation is None:
+            generation = match.get_generation()
+
         self._etag = etag
         self._file = file
         self._match = match
-        self._hash = hash(match)
+        self._generation = generation
         self._recent_manager.add_item(file.get_uri())
         self.file_changed.emit(match, is_new)
 
-    def _unload_is_not_aborted(self):
-        """Emits an unload event if match is not none"""
+    def _unload_is_not_aborted(self, retry):
+        """
+        Emits an unload event if match is not none. The unload is
+        aborted while a save is pending, and the retry function is
+        invoked once all the pending saves complete.
+        """
 
         signal = self.file_unload
         must_emit = isinstance(self._match, Match)
-        can_continue = signal.emit(self._match) if must_emit else True
+        can_continue = not self.is_saving()
+
+        if can_continue and must_emit:
+            can_continue = signal.emit(self._match)
+
+        if self.is_saving():
+            self._deferred_unload = retry
+            can_continue = False
 
         return can_continue
 
+    def _replace_is_not_aborted(self, retry):
+        """Emits an unload event if the match changed while loading"""
+
+        generation = self._get_generation(self._match)
+        is_replaced = self._match is not self._loading_match
+        is_edited = generation != self._loading_generation
+
+        if is_replaced or is_edited:
+            return self._unload_is_not_aborted(retry)
+
+        return True
+
     def _overwrite_is_not_aborted(self, file):
         """Emits an overwrite event if file changed since last read"""
 
@@ -194,6 +369,11 @@ class MatchManager(GObject.GObject):
 
         return can_continue
 
+    def _get_generation(self, match):
+        """Generation of a match or none if there is no match"""
+
+        return match.get_generation() if match else None
+
     def _is_current_file(self, file):
         """If equal to the current file"""
 
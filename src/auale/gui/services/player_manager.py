@@ -19,12 +19,15 @@
 import os
 import logging
 import shutil
+from gi.repository import GLib
 from gi.repository import GObject
 
 from uci import Engine
 from uci import Human
+from uci import LocalEngine
 from uci import Strength
 from ..values import Side
+from .engine_pool import EnginePool
 
 
 class PlayerManager(GObject.GObject):
@@ -45,6 +48,9 @@ class PlayerManager(GObject.GObject):
         self._human_player = None
         self._south_engine = None
         self._north_engine = None
+        self._failure_reason = None
+        self._pool_handlers = []
+        self._engine_pool = EnginePool.get_default()
 
     @GObject.Signal
     def engine_start_error(self, error: object):
@@ -105,6 +111,15 @@ class PlayerManager(GObject.GObject):
 
         return player
 
+    def get_engine_command(self):
+        """Command of the engine players to start"""
+
+        custom = self._get_custom_command()
+        default = self._get_default_command()
+        command = custom if self._has_custom_command() else default
+
+        return command
+
     def set_engine_strength(self, strength):
         """Sets the engine strength"""
 
@@ -123,23 +138,50 @@ class PlayerManager(GObject.GObject):
     def set_engine_command(self, command):
         """Sets a custom engine command to use"""
 
-        value = command or self.__DEFAULT_COMMAND
-        self._engine_command = value.strip()
+        value = (command or '').strip()
+        self._engine_command = value or self.__DEFAULT_COMMAND
         self._logger.debug(f'Engine command: { self._engine_command }')
 
     def on_engine_failure(self, engine, reason):
         """Handle engine termination errors"""
 
-        self._south_engine.quit()
-        self._north_engine.quit()
-        self._south_engine = Human()
-        self._north_engine = Human()
         self._logger.warning(reason)
-        self.engine_failure_error.emit(reason)
+        self._failure_reason = reason
+        self._engine_pool.respawn(engine)
+
+    def on_engine_replaced(self, pool, engine, replacement):
+        """Swaps a crashed engine for its respawned replacement"""
+
+        if engine in (self._south_engine, self._north_engine):
+            engine.disconnect_by_func(self.on_engine_failure)
+            replacement.connect('failure', self.on_engine_failure)
+            replacement.set_playing_strength(self._engine_strength)
+
+        if engine is self._south_engine:
+            self._south_engine = replacement
+
+        if engine is self._north_engine:
+            self._north_engine = replacement
+
+    def on_engine_lost(self, pool, engine):
+        """Disables the engines if a crashed one can't be respawned"""
+
+        if engine in (self._south_engine, self._north_engine):
+            reason = self._failure_reason or 'Engine is not responding'
+            self._release_engine(self._south_engine)
+            self._release_engine(self._north_engine)
+
+            is_builtin = isinstance(engine, LocalEngine)
+
+            if is_builtin or not self._start_builtin_engines():
+                self._south_engine = Human()
+                self._north_engine = Human()
+                GLib.idle_add(self.engine_failure_error.emit, reason)
 
     def start_players(self):
         """Starts the player processes"""
 
+        self._connect_pool_signals()
         self._south_engine = self._create_engine()
         self._north_engine = self._create_engine()
         self._human_player = Human()
@@ -147,21 +189,53 @@ class PlayerManager(GObject.GObject):
     def quit_players(self):
         """Quits all the running players"""
 
-        self._south_engine.quit()
-        self._north_engine.quit()
+        self._disconnect_pool_signals()
+        self._release_engine(self._south_engine)
+        self._release_engine(self._north_engine)
         self._human_player.quit()
 
     def _create_engine(self):
         """Creates a new engine player"""
 
         try:
-            custom = self._get_custom_command()
-            default = self._get_default_command()
-            command = custom if self._has_custom_command() else default
+            command = self.get_engine_command()
             engine = self._create_engine_for_command(command)
         except BaseException as error:
             self._logger.warning(f'Could not start engine')
-            self.engine_start_error.emit(error)
+            engine = self._create_builtin_engine()
+
+            if not isinstance(engine, LocalEngine):
+                self.engine_start_error.emit(error)
+
+        return engine
+
+    def _start_builtin_engines(self):
+        """Replaces both engines with in-process engines if possible"""
+
+        south_engine = self._create_builtin_engine()
+        north_engine = self._create_builtin_engine()
+        engines = (south_engine, north_engine)
+        is_started = all(isinstance(e, LocalEngine) for e in engines)
+
+        if is_started is True:
+            self._south_engine = south_engine
+            self._north_engine = north_engine
+        else:
+            self._release_engine(south_engine)
+            self._release_engine(north_engine)
+
+        return is_started
+
+    def _create_builtin_engine(self):
+        """Creates an in-process engine player or a human"""
+
+        try:
+            command = LocalEngine.COMMAND
+            engine = self._create_engine_for_command(command)
+            engine.set_playing_strength(self._engine_strength)
+            self._logger.warning('Using the built-in engine')
+        except BaseException:
+            self._logger.warning('Could not start the built-in engine')
             engine = Human()
 
         return engine
@@ -169,11 +243,35 @@ class PlayerManager(GObject.GObject):
     def _create_engine_for_command(self, command):
         """Create an engine player for the given command"""
 
-        engine = Engine(command)
+        engine = self._engine_pool.lease(command)
         engine.connect('failure', self.on_engine_failure)
 
         return engine
 
+    def _release_engine(self, player):
+        """Returns an engine player to the pool"""
+
+        if isinstance(player, Engine):
+            player.disconnect_by_func(self.on_engine_failure)
+            self._engine_pool.release(player)
+
+    def _connect_pool_signals(self):
+        """Listens for engines respawned by the pool"""
+
+        if not self._pool_handlers:
+            pool = self._engine_pool
+            replaced = pool.connect('engine-replaced', self.on_engine_replaced)
+            lost = pool.connect('engine-lost', self.on_engine_lost)
+            self._pool_handlers = [replaced, lost]
+
+    def _disconnect_pool_signals(self):
+        """Stops listening for engines respawned by the pool"""
+
+        for handler in self._pool_handlers:
+            self._engine_pool.disconnect(handler)
+
+        self._pool_handlers = []
+
     def _has_custom_command(self):
         """Checks if a custom engine command was set"""
 
@@ -16,37 +16,244 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+
+import logging
+import os
+import sqlite3
+
+from collections import namedtuple
 from collections import OrderedDict
+from queue import Queue
+from threading import Lock
+from threading import Thread
+from book import compute_hash_code
+from gi.repository import GLib
+
+Entry = namedtuple('Entry', (
+    'move',     # Best move found for the position
+    'ponder',   # Expected reply to the best move or none
+    'score',    # Score of the best move or none
+    'depth',    # Search depth of the best move or none
+))
+
 
+class PonderCache(object):
+    """
+    Least recently used cache of the moves engines played. Entries are
+    keyed by the hash code of the searched position and may be stored
+    on a database, so that positions are remembered across sessions.
+    Results of deeper searches are never replaced by shallower ones.
+    Writes are queued to a worker thread with its own connection, which
+    then refreshes the memory with the entry that survived on the
+    database; reads give up quickly if the database is busy.
+    """
 
-class PonderCache(OrderedDict):
-    """A cache to store ponder moves"""
+    __read_timeout = 0.05
+    __write_timeout = 10.0
 
-    def __init__(self, size):
+    __schema = (
+        'CREATE TABLE IF NOT EXISTS positions ('
+        'hash INTEGER PRIMARY KEY, move INTEGER NOT NULL, ponder INTEGER, '
+        'score INTEGER, depth INTEGER)'
+    )
+
+    __insert = (
+        'INSERT INTO positions VALUES (?, ?, ?, ?, ?) '
+        'ON CONFLICT (hash) DO UPDATE SET move = excluded.move, '
+        'ponder = excluded.ponder, score = excluded.score, '
+        'depth = excluded.depth WHERE IFNULL(excluded.depth, 0) >= '
+        'IFNULL(positions.depth, 0)'
+    )
+
+    __select = (
+        'SELECT move, ponder, score, depth FROM positions WHERE hash = ?'
+    )
+
+    def __init__(self, size, path=None):
         self._size = size
+        self._path = path
+        self._entries = OrderedDict()
+        self._logger = logging.getLogger('ponder-cache')
+        self._database = self._connect(path, self.__read_timeout)
+        self._writes = Queue()
+        self._writer = self._start_writer()
+        self._lock = Lock()
+
+    @property
+    def size(self):
+        """Maximum number of entries kept in memory"""
+
+        return self._size
+
+    @staticmethod
+    def get_default_path():
+        """Path of the database on the user's cache directory"""
+
+        cache_path = GLib.get_user_cache_dir()
+        path = os.path.join(cache_path, 'auale', 'ponder-cache.db')
+
+        return path
 
     def fetch(self, match):
-        """Obtains a value for the given match"""
+        """Ponder move for the last move played on a match or none"""
 
-        move = match.get_move()
         index = match.get_current_index()
-        positions = match.get_positions()
-        hashcode = hash((move, positions[:index]))
 
-        return self.get(hashcode, None)
+        if index < 1:
+            return None
 
-    def store(self, match, move, value):
-        """Stores a value for the given match and move"""
+        move = match.get_move()
+        board = match.get_board(index - 1)
+        turn = -match.get_turn()
+        entry = self.lookup(board, turn)
 
-        if len(self) >= self._size:
-            self.popitem()
+        if entry is not None and entry.move == move:
+            return entry.ponder
 
-        positions = match.get_positions()
-        hashcode = hash((move, positions))
-        self[hashcode] = value
+        return None
 
-    @property
-    def size(self):
-        """Requested size of this dictionary"""
+    def lookup(self, board, turn):
+        """Stored entry for a position or none"""
 
-        return self._size
+        code = compute_hash_code(board, turn)
+
+        with self._lock:
+            entry = self._entries.get(code)
+
+            if entry is not None:
+                self._entries.move_to_end(code)
+            else:
+                entry = self._select_entry(code)
+
+                if entry is not None:
+                    self._insert_entry(code, entry)
+
+        return entry
+
+    def store(self, match, move, value, score=None, depth=None):
+        """Stores the best and ponder moves for a match position"""
+
+        board = match.get_board()
+        turn = match.get_turn()
+        code = compute_hash_code(board, turn)
+        entry = Entry(move, value, score, depth)
+
+        with self._lock:
+            stored = self._entries.get(code)
+
+            if stored is None or (depth or 0) >= (stored.depth or 0):
+                self._insert_entry(code, entry)
+
+        if self._writer is not None:
+            self._writes.put((code, entry))
+
+    def close(self):
+        """Closes the database if there is one"""
+
+        if self._writer is not None:
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+                self._database = None
+
+    def _insert_entry(self, code, entry):
+        """Adds an entry evicting the least recently used"""
+
+        self._entries[code] = entry
+        self._entries.move_to_end(code)
+
+        while len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+
+    def _select_entry(self, code):
+        """Reads an entry from the database or returns none"""
+
+        if self._database is None:
+            return None
+
+        try:
+            cursor = self._database.execute(self.__select, (code,))
+            values = cursor.fetchone()
+        except sqlite3.Error:
+            self._logger.warning('Cannot read from the ponder cache')
+            values = None
+
+        return values and Entry(*values)
+
+    def _start_writer(self):
+        """Starts the thread that writes entries to the database"""
+
+        if self._database is None:
+            return None
+
+        writer = Thread(target=self._write_entries)
+        writer.daemon = True
+        writer.start()
+
+        return writer
+
+    def _write_entries(self):
+        """Writes the queued entries on the worker thread"""
+
+        database = self._connect(self._path, self.__write_timeout)
+
+        while True:
+            item = self._writes.get()
+
+            if item is None:
+                break
+
+            if database is not None:
+                code, entry = item
+                saved = self._save_entry(database, code, entry)
+                self._refresh_entry(code, saved)
+
+        if database is not None:
+            database.close()
+
+    def _refresh_entry(self, code, entry):
+        """Replaces a cached entry with the one kept on the database"""
+
+        with self._lock:
+            if entry is not None and code in self._entries:
+                self._entries[code] = entry
+
+    def _save_entry(self, database, code, entry):
+        """Writes an entry and returns the one kept on the database"""
+
+        try:
+            with database:
+                database.execute(self.__insert, (code, *entry))
+                cursor = database.execute(self.__select, (code,))
+                values = cursor.fetchone()
+        except sqlite3.Error:
+            self._logger.warning('Cannot write to the ponder cache')
+            values = None
+
+        return values and Entry(*values)
+
+    def _connect(self, path, timeout):
+        """Opens the database or returns none if it can't"""
+
+        if path is None:
+            return None
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            setup_timeout = self.__write_timeout
+            busy_timeout = int(1000 * timeout)
+            database = sqlite3.connect(path, setup_timeout,
+                check_same_thread=False)
+            database.execute('PRAGMA journal_mode = WAL')
+            database.execute('PRAGMA synchronous = NORMAL')
+            database.execute(self.__schema)
+            database.execute(f'PRAGMA busy_timeout = { busy_timeout }')
+        except (OSError, sqlite3.Error):
+            self._logger.warning(f'Cannot open the ponder cache: { path }')
+            database = None
+
+        return database
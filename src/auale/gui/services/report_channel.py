@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+from gi.repository import GLib
+
+
+class ReportChannel(object):
+    """
+    Coalesces player reports on their way to the main loop. Only the
+    latest report of each player is kept and pending reports are
+    delivered together at most once per refresh interval.
+    """
+
+    def __init__(self, callback, interval=16):
+        self._callback = callback
+        self._interval = interval
+        self._pending = dict()
+        self._source_id = None
+        self._lock = Lock()
+
+        self._received = 0
+        self._delivered = 0
+        self._merged = 0
+        self._dropped = 0
+
+    @property
+    def counters(self):
+        """Received, delivered, merged and dropped report counts"""
+
+        return {
+            'received': self._received,
+            'delivered': self._delivered,
+            'merged': self._merged,
+            'dropped': self._dropped,
+        }
+
+    def post(self, player, report):
+        """Queues a report replacing any pending one of the player"""
+
+        with self._lock:
+            self._received += 1
+
+            if player in self._pending:
+                self._merged += 1
+
+            self._pending[player] = report
+
+            if self._source_id is None:
+                callback = self._deliver_pending
+                self._source_id = GLib.timeout_add(self._interval, callback)
+
+    def clear(self):
+        """Drops all the reports that were not delivered yet"""
+
+        with self._lock:
+            self._dropped += len(self._pending)
+            self._pending.clear()
+
+    def _deliver_pending(self):
+        """Delivers the pending reports on the main loop"""
+
+        with self._lock:
+            pending = self._pending
+            self._pending = dict()
+            self._source_id = None
+            self._delivered += len(pending)
+
+        for player, report in pending.items():
+            self._callback(player, report)
+
+        return GLib.SOURCE_REMOVE
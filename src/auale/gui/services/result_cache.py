@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+
+from collections import namedtuple
+from collections import OrderedDict
+from threading import Lock
+from book import compute_hash_code
+from uci import Strength
+
+Entry = namedtuple('Entry', (
+    'values',   # Best move values received from the engine
+    'expiry',   # Monotonic time after which the entry is stale
+))
+
+
+class ResultCache(object):
+    """
+    Least recently used cache of engine search results. Entries are
+    keyed by the hash code of the searched position, the strength of
+    the search and the engine that performed it, so that a position
+    already searched can be answered without asking the engine again.
+    Entries expire after a configurable amount of seconds. Only results
+    of the strengths that search deterministically are cached, so that
+    the stronger levels keep varying their replies.
+    """
+
+    __strengths = (Strength.EASY, Strength.MEDIUM)
+
+    def __init__(self, size, ttl):
+        self._size = size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get_size(self):
+        """Maximum number of entries kept on the cache"""
+
+        return self._size
+
+    def set_size(self, size):
+        """Sets the maximum number of entries kept on the cache"""
+
+        with self._lock:
+            self._size = max(0, size)
+            self._evict_entries()
+
+    def get_ttl(self):
+        """Seconds a result is kept on the cache"""
+
+        return self._ttl
+
+    def set_ttl(self, ttl):
+        """Sets the seconds a result is kept on the cache"""
+
+        self._ttl = max(0, ttl)
+
+    def is_cacheable(self, engine):
+        """Checks if the results of an engine may be cached"""
+
+        strength = engine.get_playing_strength()
+        is_cacheable = strength in self.__strengths
+
+        return is_cacheable
+
+    def lookup(self, engine, match):
+        """Best move values an engine found for a match position"""
+
+        if not self.is_cacheable(engine):
+            return None
+
+        key = self._get_key(engine, match)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            if entry.expiry < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        return entry.values
+
+    def store(self, engine, match, values):
+        """Stores the best move values an engine found for a match"""
+
+        if not self.is_cacheable(engine):
+            return
+
+        key = self._get_key(engine, match)
+        expiry = time.monotonic() + self._ttl
+
+        with self._lock:
+            self._entries[key] = Entry(values, expiry)
+            self._entries.move_to_end(key)
+            self._evict_entries()
+
+    def clear(self):
+        """Removes all the entries from the cache"""
+
+        with self._lock:
+            self._entries.clear()
+
+    def _get_key(self, engine, match):
+        """Cache key for an engine searching a match position"""
+
+        board = match.get_board()
+        turn = match.get_turn()
+        code = compute_hash_code(board, turn)
+        strength = engine.get_playing_strength()
+        command = tuple(engine.get_command())
+
+        return (code, strength, command)
+
+    def _evict_entries(self):
+        """Removes the least recently used entries above the size"""
+
+        while len(self._entries) > self._size:
+            self._entries.popitem(last=False)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import logging
+
+from threading import RLock
+from game import Match
+
+from .engine_pool import EnginePool
+
+
+class Speculator(object):
+    """
+    Searches the likely replies to an engine move on idle pool engines.
+    Each borrowed engine searches the position after a different reply
+    with the playing strength of the player. Once the reply is known,
+    the search on that position is promoted and its best move is handed
+    to a callback, either at once or as soon as the search ends, while
+    the other searches are cancelled.
+    """
+
+    def __init__(self, move_callback, info_callback, width=0):
+        self._move_callback = move_callback
+        self._info_callback = info_callback
+        self._width = width
+        self._engines = dict()
+        self._results = dict()
+        self._promoted = None
+        self._lock = RLock()
+        self._logger = logging.getLogger('game-loop')
+        self._pool = EnginePool.get_default()
+
+    def get_width(self):
+        """Maximum number of replies searched at once"""
+
+        return self._width
+
+    def set_width(self, width):
+        """Sets the maximum number of replies searched at once"""
+
+        self._width = max(0, width)
+
+    def start(self, player, match, replies):
+        """Searches the given replies on a match, most likely first"""
+
+        self.cancel()
+
+        if self._width < 1 or match.has_ended():
+            return
+
+        command = player.get_command()
+        strength = player.get_playing_strength()
+
+        with self._lock:
+            for move in replies[:self._width]:
+                engine = self._pool.borrow(command)
+                if engine is None: break
+                position = self._get_reply_position(match, move)
+                self._start_search(engine, strength, position)
+
+        self._logger.debug(f'Speculating on { len(self._engines) } replies')
+
+    def promote(self, match):
+        """
+        Promotes the search on the current position of a match if there
+        is one and cancels the others. Returns if a search was promoted.
+        """
+
+        with self._lock:
+            position = match.get_position()
+            engine = self._find_engine(position)
+            values = self._results.get(engine)
+            self._promoted = engine
+
+            for other in list(self._engines):
+                if other is not engine:
+                    self._release_engine(other)
+
+        if engine is not None and values is not None:
+            self._finish_search(engine, values)
+
+        return engine is not None
+
+    def cancel(self):
+        """Cancels all the ongoing searches"""
+
+        with self._lock:
+            self._promoted = None
+
+            for engine in list(self._engines):
+                self._release_engine(engine)
+
+    def _get_reply_position(self, match, move):
+        """New match on the position that follows a reply"""
+
+        board, turn = match.get_position()
+        position = Match(match.get_game())
+        position.set_position(board, turn)
+        position.add_move(move)
+
+        return position
+
+    def _find_engine(self, position):
+        """Engine searching the given position or none"""
+
+        for engine, match in self._engines.items():
+            if match.get_position() == position:
+                return engine
+
+        return None
+
+    def _start_search(self, engine, strength, match):
+        """Starts searching a reply position on a borrowed engine"""
+
+        self._engines[engine] = match
+        engine.set_playing_strength(strength)
+        engine.connect('move-received', self._on_move_received)
+        engine.connect('info-received', self._on_info_received)
+        engine.start_new_match(match)
+        engine.start_thinking(match)
+
+    def _release_engine(self, engine):
+        """Stops a search and returns its engine to the pool"""
+
+        self._engines.pop(engine, None)
+        self._results.pop(engine, None)
+
+        engine.disconnect_by_func(self._on_move_received)
+        engine.disconnect_by_func(self._on_info_received)
+        engine.stop_thinking()
+        self._pool.release(engine)
+
+    def _finish_search(self, engine, values):
+        """Hands the best move of the promoted search to the callback"""
+
+        with self._lock:
+            if engine is not self._promoted:
+                return
+
+            match = self._engines.get(engine)
+            self._promoted = None
+            self._release_engine(engine)
+
+        self._move_callback(match, values)
+
+    def _on_move_received(self, engine, values):
+        """Keeps the result of a search or finishes a promoted one"""
+
+        with self._lock:
+            if engine not in self._engines:
+                return
+
+            if engine is not self._promoted:
+                self._results[engine] = values
+                return
+
+        self._finish_search(engine, values)
+
+    def _on_info_received(self, engine, values):
+        """Forwards the reports of a promoted search"""
+
+        if engine is self._promoted:
+            self._info_callback(values)
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import logging
+
 from gi.repository import Clutter
 from gi.repository import Gdk
 from gi.repository import GLib
@@ -27,6 +29,8 @@ from ..actors import House
 from ..values import RipeningStage
 from ..values import Rotation
 from .board_animator import BoardAnimator
+from .frame_timer import FrameTimer
+from .seed_atlas import SeedAtlas
 
 
 class BoardCanvas(GtkClutter.Embed):
@@ -37,12 +41,18 @@ class BoardCanvas(GtkClutter.Embed):
     _display = Gdk.Display.get_default()
     _pointer_cursor = Gdk.Cursor.new_from_name(_display, 'pointer')
     _hidden_cursor = Gdk.Cursor.new_from_name(_display, 'none')
+    _resize_delay = 200
 
     def __init__(self):
         super(BoardCanvas, self).__init__()
 
         self._script = theme.create_canvas_script()
         self._animator = BoardAnimator(self)
+        self._atlas = self.create_seed_atlas()
+        self._frame_timer = FrameTimer()
+        self._logger = logging.getLogger('board-canvas')
+        self._resize_source = None
+        self._is_resizing = False
         self._rotation = Rotation.BASE
         self._is_reactive = True
         self._activables = []
@@ -91,11 +101,23 @@ class BoardCanvas(GtkClutter.Embed):
         stage.set_no_clear_hint(True)
         stage.add_child(root)
 
+    def create_seed_atlas(self):
+        """Creates the pre-rendered textures of the house glyphs"""
+
+        names = [f'seed-canvas-{ n }' for n in range(49)]
+        names.append('ripe-canvas')
+        glyphs = {name: self.get_object(name) for name in names}
+        atlas = SeedAtlas(glyphs)
+
+        return atlas
+
     def connect_canvas_signals(self):
         """Connects the required signals"""
 
         stage = self.get_stage()
         stage.connect('allocation-changed', self.on_allocation_changed)
+        stage.connect('after-paint', self.on_stage_after_paint)
+        self._atlas.connect('atlas-ready', self.on_atlas_ready)
 
         for house in self.get_children('houses'):
             house.connect('house-activated', self.on_house_activated)
@@ -113,6 +135,11 @@ class BoardCanvas(GtkClutter.Embed):
 
         return self._animator
 
+    def get_frame_timer(self):
+        """Obtain the frame timer of the last resize"""
+
+        return self._frame_timer
+
     def get_object(self, name):
         """Obtains a board object given its name"""
 
@@ -131,7 +158,10 @@ class BoardCanvas(GtkClutter.Embed):
     def get_seed_canvas(self, number):
         """Canvas for the given number of seeds"""
 
-        return self.get_object(f'seed-canvas-{ number }')
+        name = f'seed-canvas-{ number }'
+        texture = self._atlas.get_texture(name)
+
+        return texture or self.get_object(name)
 
     def get_sow_canvas(self, number):
         """Hint for the given number of seeds"""
@@ -374,6 +404,44 @@ class BoardCanvas(GtkClutter.Embed):
             scale = min(stage_width / width, stage_height / height)
             child.set_scale(scale, scale)
 
+        self._schedule_rasterization()
+
+    def on_resize_settled(self):
+        """Render the textures once the stage size is stable"""
+
+        scene = self.get_object('scene')
+        scale, scale_y = scene.get_scale()
+        factor = self.get_scale_factor()
+        statistics = self._frame_timer.get_statistics()
+
+        self._resize_source = None
+        self._is_resizing = False
+        self._atlas.set_scale(scale * factor)
+        self._logger.debug(
+            f'Resized in { statistics.count } frames '
+            f'({ statistics.mean:.1f} ms mean, '
+            f'{ statistics.worst:.1f} ms worst)')
+
+        return GLib.SOURCE_REMOVE
+
+    def on_stage_after_paint(self, stage):
+        """Measure the frame times while the stage is resized"""
+
+        if self._is_resizing is True:
+            self._frame_timer.tick()
+
+    def on_atlas_ready(self, atlas, scale):
+        """Swap the house glyphs for the pre-rendered textures"""
+
+        actors = self.get_children('houses') + self.get_children('states')
+
+        for actor in actors:
+            content = actor.get_content()
+            texture = atlas.get_replacement(content)
+
+            if texture is not None:
+                actor.set_content(texture)
+
     def on_house_activated(self, house):
         """Bubble house activation signals"""
 
@@ -417,6 +485,20 @@ class BoardCanvas(GtkClutter.Embed):
 
         self.show_message() if visible else self.hide_message()
 
+    def _schedule_rasterization(self):
+        """Postpones rendering the textures until resizing ends"""
+
+        if self._is_resizing is False:
+            self._is_resizing = True
+            self._frame_timer.reset()
+
+        if self._resize_source is not None:
+            GLib.source_remove(self._resize_source)
+
+        callback = self.on_resize_settled
+        delay = self._resize_delay
+        self._resize_source = GLib.timeout_add(delay, callback)
+
     def _refresh_house_focus(self, house):
         """Ensures this widget is focused"""
 
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+
+from collections import deque
+from collections import namedtuple
+
+FrameStatistics = namedtuple('FrameStatistics', (
+    'count',    # Number of frames measured
+    'mean',     # Average time between frames in milliseconds
+    'worst',    # Longest time between frames in milliseconds
+))
+
+
+class FrameTimer(object):
+    """
+    Measures the time elapsed between consecutive painted frames. Only
+    the most recent intervals are kept, so that the statistics reflect
+    the current rendering performance.
+    """
+
+    def __init__(self, size=240):
+        self._intervals = deque(maxlen=size)
+        self._last_frame = None
+
+    def reset(self):
+        """Forgets all the measured frames"""
+
+        self._intervals.clear()
+        self._last_frame = None
+
+    def tick(self):
+        """Records that a new frame was painted"""
+
+        now = time.monotonic()
+
+        if self._last_frame is not None:
+            interval = 1000.0 * (now - self._last_frame)
+            self._intervals.append(interval)
+
+        self._last_frame = now
+
+    def get_statistics(self):
+        """Statistics of the measured frame intervals"""
+
+        count = len(self._intervals)
+        mean = sum(self._intervals) / count if count else 0.0
+        worst = max(self._intervals, default=0.0)
+        statistics = FrameStatistics(count, mean, worst)
+
+        return statistics
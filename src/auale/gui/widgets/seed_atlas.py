@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import cairo
+import logging
+
+from collections import OrderedDict
+from threading import Lock
+from threading import Thread
+from gi.repository import Clutter
+from gi.repository import Cogl
+from gi.repository import Gio
+from gi.repository import GLib
+from gi.repository import GObject
+from gi.repository import Rsvg
+
+
+class SeedAtlas(GObject.GObject):
+    """
+    Textures of the seed glyphs pre-rendered for a display scale. The
+    glyphs are rasterized on a worker thread and only uploaded as images
+    on the main loop; the textures of the most recent scales are kept,
+    so that houses can swap their contents without drawing anything.
+    """
+
+    __gtype_name__ = 'SeedAtlas'
+    __cache_size = 3
+    __scale_step = 20.0
+
+    def __init__(self, glyphs):
+        GObject.GObject.__init__(self)
+
+        self._glyphs = self._get_specs(glyphs)
+        self._names = {v: k for k, v in glyphs.items()}
+        self._textures = OrderedDict()
+        self._current = dict()
+        self._scale = None
+        self._pending_scale = None
+        self._is_rendering = False
+        self._lock = Lock()
+        self._logger = logging.getLogger('seed-atlas')
+
+    @GObject.Signal
+    def atlas_ready(self, scale: float):
+        """Emitted when the textures for the current scale are ready"""
+
+    def get_scale(self):
+        """Scale of the current textures or none"""
+
+        return self._scale
+
+    def get_texture(self, name):
+        """Pre-rendered image for a glyph name or none"""
+
+        return self._current.get(name)
+
+    def get_replacement(self, content):
+        """Current texture that shows the same glyph as a content"""
+
+        name = self._names.get(content)
+        texture = self._current.get(name)
+
+        return texture
+
+    def set_scale(self, scale):
+        """Switches to the textures of a scale, rendering them if needed"""
+
+        scale = round(scale * self.__scale_step) / self.__scale_step
+        scale = max(1.0 / self.__scale_step, scale)
+
+        if scale == self._scale:
+            return
+
+        if scale in self._textures:
+            self._switch_to_scale(scale)
+            return
+
+        with self._lock:
+            self._pending_scale = scale
+
+            if self._is_rendering is False:
+                self._is_rendering = True
+                self._start_worker(scale)
+
+    def _get_specs(self, glyphs):
+        """Path, fragment and size of each glyph to pre-render"""
+
+        specs = dict()
+
+        for name, glyph in glyphs.items():
+            path = glyph.get_path()
+            fragment = glyph.get_fragment()
+            width = glyph.get_property('width')
+            height = glyph.get_property('height')
+
+            if path and fragment:
+                specs[name] = (path, fragment, width, height)
+
+        return specs
+
+    def _start_worker(self, scale):
+        """Starts rendering the glyphs of a scale on a thread"""
+
+        thread = Thread(target=self._render_glyphs, args=(scale,))
+        thread.daemon = True
+        thread.start()
+
+    def _render_glyphs(self, scale):
+        """Rasterizes every glyph for a scale on the worker thread"""
+
+        handles = dict()
+        pixels = dict()
+
+        try:
+            for name, spec in self._glyphs.items():
+                path, fragment, width, height = spec
+
+                if path not in handles:
+                    handles[path] = self._create_svg_handle(path)
+
+                handle = handles[path]
+                pixels[name] = self._rasterize(handle, spec, scale)
+        except BaseException as error:
+            self._logger.warning(f'Cannot render the seed atlas: { error }')
+            pixels = None
+
+        GLib.idle_add(self._on_glyphs_rendered, scale, pixels)
+
+    def _rasterize(self, handle, spec, scale):
+        """Renders a glyph fragment into raw pixel data"""
+
+        path, fragment, width, height = spec
+        view_size = handle.get_dimensions()
+        surface_width = max(1, int(round(width * scale)))
+        surface_height = max(1, int(round(height * scale)))
+        x = (width / 2.0) - (view_size.width / 2.0)
+        y = (height / 2.0) - (view_size.height / 2.0)
+
+        format = cairo.Format.ARGB32
+        surface = cairo.ImageSurface(format, surface_width, surface_height)
+        context = cairo.Context(surface)
+        context.scale(scale, scale)
+        context.translate(x, y)
+        handle.render_cairo_sub(context, fragment)
+        surface.flush()
+
+        data = bytes(surface.get_data())
+        stride = surface.get_stride()
+
+        return (data, surface_width, surface_height, stride)
+
+    def _create_svg_handle(self, path):
+        """Creates an .svg handle owned by the worker thread"""
+
+        flags = Gio.ResourceLookupFlags.NONE
+        data = Gio.resources_lookup_data(path, flags)
+        handle = Rsvg.Handle.new_from_data(data.get_data())
+
+        return handle
+
+    def _create_texture(self, pixels):
+        """Uploads raw pixel data into a new image"""
+
+        data, width, height, stride = pixels
+        format = Cogl.PixelFormat.BGRA_8888_PRE
+        image = Clutter.Image()
+        image.set_data(data, format, width, height, stride)
+
+        return image
+
+    def _on_glyphs_rendered(self, scale, pixels):
+        """Stores the textures of a scale and renders the next one"""
+
+        if pixels is not None:
+            textures = dict()
+
+            for name, values in pixels.items():
+                texture = self._create_texture(values)
+                self._names[texture] = name
+                textures[name] = texture
+
+            self._store_textures(scale, textures)
+
+            if scale == self._pending_scale:
+                self._switch_to_scale(scale)
+
+        with self._lock:
+            pending = self._pending_scale
+            is_pending = pending not in self._textures
+
+            if pixels is not None and is_pending is True:
+                self._start_worker(pending)
+            else:
+                self._is_rendering = False
+
+    def _store_textures(self, scale, textures):
+        """Caches the textures of a scale evicting the oldest ones"""
+
+        self._textures[scale] = textures
+        self._textures.move_to_end(scale)
+
+        while len(self._textures) > self.__cache_size:
+            scale, evicted = self._textures.popitem(last=False)
+
+            for texture in evicted.values():
+                self._names.pop(texture, None)
+
+    def _switch_to_scale(self, scale):
+        """Makes the textures of a cached scale the current ones"""
+
+        self._scale = scale
+        self._pending_scale = scale
+        self._current = self._textures[scale]
+        self._textures.move_to_end(scale)
+        self.atlas_ready.emit(scale)
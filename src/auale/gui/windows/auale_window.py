@@ -67,6 +67,7 @@ class AualeWindow(Gtk.ApplicationWindow):
         self._player_manager = PlayerManager()
         self._sound_context = theme.create_sound_context()
         self._book = self.create_opening_book()
+        self._game_loop.set_opening_book(self._book)
 
         self._about_dialog = AboutDialog(self)
         self._new_match_dialog = NewMatchDialog(self)
@@ -139,6 +140,13 @@ class AualeWindow(Gtk.ApplicationWindow):
 
         return opening_book
 
+    def apply_cache_settings(self):
+        """Applies the result cache settings to the game loop"""
+
+        size = self._settings.get_int('result-cache-size')
+        ttl = self._settings.get_int('result-cache-ttl')
+        self._game_loop.set_result_cache_limits(size, ttl)
+
     def apply_engine_settings(self):
         """Applies the strength setting to the engines"""
 
@@ -152,6 +160,12 @@ class AualeWindow(Gtk.ApplicationWindow):
         is_muted = self._settings.get_value('mute')
         context.mute_context() if is_muted else context.unmute_context()
 
+    def apply_speculation_settings(self):
+        """Applies the speculative replies setting to the game loop"""
+
+        width = self._settings.get_int('speculative-replies')
+        self._game_loop.set_speculation_width(width)
+
     def apply_strength_settings(self):
         """Applies the strength setting to the engines"""
 
@@ -202,7 +216,7 @@ class AualeWindow(Gtk.ApplicationWindow):
         if isinstance(player, Human):
             self.request_human_move(player, match)
         else:
-            self.request_engine_move(player, match)
+            self._game_loop.request_move(player, match)
 
         GLib.idle_add(self.refresh_view)
 
@@ -212,26 +226,6 @@ class AualeWindow(Gtk.ApplicationWindow):
         self._game_loop.request_move(player, match)
         self._board_canvas.show_activables(match)
 
-    def request_engine_move(self, player, match):
-        """Request a move to an engine player"""
-
-        strength = player.get_playing_strength()
-        self._book.set_strength(strength)
-
-        if not self.request_book_move(match):
-            self._game_loop.request_move(player, match)
-
-    def request_book_move(self, match):
-        """Request a move from the openings book"""
-
-        book_move = self._book.pick_best_move(match)
-        has_move = book_move is not None
-
-        if has_move is True:
-            self.make_legal_move(match, book_move)
-
-        return has_move
-
     def toggle_active_player(self, match):
         """Requests a move to the current player of a match"""
 
@@ -240,6 +234,18 @@ class AualeWindow(Gtk.ApplicationWindow):
 
         return player
 
+    def start_new_match(self, side):
+        """Starts a new match with the engine playing a side"""
+
+        retry = lambda: self.start_new_match(side)
+        match = self._match_manager.load_new_match(retry)
+
+        if not self._match_manager.has_unsaved_changes():
+            self._game_loop.abort_move()
+            self.set_engine_side(side)
+            self.toggle_active_player(match)
+            self.match_started.emit()
+
     def on_match_file_changed(self, manager, match, is_new):
         """Emitted when the match file changed"""
 
@@ -408,7 +414,7 @@ class AualeWindow(Gtk.ApplicationWindow):
     def on_player_info_received(self, game_loop, player, report):
         """A report was received from an engine player"""
 
-        if report.get('cp') or report.get('pv'):
+        if report.cp is not None or report.pv:
             infobar = self._board_canvas.get_object('report')
             infobar.show_principal_variation(report)
 
@@ -458,14 +464,8 @@ class AualeWindow(Gtk.ApplicationWindow):
         response = self._new_match_dialog.run()
 
         if response == Gtk.ResponseType.ACCEPT:
-            match = self._match_manager.load_new_match()
-
-            if not self._match_manager.has_unsaved_changes():
-                self._game_loop.abort_move()
-                side = self._new_match_dialog.get_engine_side()
-                self.set_engine_side(side)
-                self.toggle_active_player(match)
-                self.match_started.emit()
+            side = self._new_match_dialog.get_engine_side()
+            self.start_new_match(side)
 
     def on_open_action_activate(self, action, value):
         """Opens a match from a file"""
@@ -630,19 +630,22 @@ class AualeWindow(Gtk.ApplicationWindow):
         self._active_player = self._player_manager.get_human_player()
         self._board_canvas.show_match(match)
 
+        self.apply_cache_settings()
         self.apply_sound_settings()
         self.apply_strength_settings()
+        self.apply_speculation_settings()
         self.connect_sound_signals()
         self.refresh_view()
 
     def on_window_delete_event(self, window, event):
         """Emitted when the user asks to close the window"""
 
-        return self._match_manager.unload()
+        return self._match_manager.unload(self.close)
 
     def on_window_destroy(self, window):
         """Emitted to finalize the window"""
 
+        self._game_loop.disconnect_players()
         self._player_manager.quit_players()
         self._sound_context.mute_context()
 
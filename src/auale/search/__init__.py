@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from .alphabeta import AlphaBeta
+from .service import UCIService
+
+__all__ = [
+    'AlphaBeta',
+    'UCIService',
+]
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+
+from game import Oware
+
+
+class SearchTimeout(Exception):
+    """Raised to unwind a search that must stop"""
+
+
+class AlphaBeta(object):
+    """
+    Iterative deepening alpha-beta search for oware positions. Scores
+    are the difference of captured seeds, in hundredths of a seed, from
+    the point of view of the player to move. A transposition table keeps
+    the bounds and best move of each searched position, and the move it
+    stores is tried first on the next iteration.
+    """
+
+    WIN_SCORE = 10000
+    MAX_DEPTH = 64
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    __check_mask = 0x3FF
+
+    def __init__(self, capacity=1 << 18):
+        self._capacity = capacity
+        self._tables = {Oware.SOUTH: dict(), Oware.NORTH: dict()}
+        self._callback = None
+        self._deadline = None
+        self._is_aborted = False
+        self._nodes = 0
+
+    def get_nodes(self):
+        """Number of nodes visited by the last search"""
+
+        return self._nodes
+
+    def set_callback(self, callback):
+        """
+        Function called after each completed iteration with the depth,
+        score, visited nodes, elapsed seconds and principal variation.
+        """
+
+        self._callback = callback
+
+    def clear(self):
+        """Forgets all the positions on the transposition table"""
+
+        for table in self._tables.values():
+            table.clear()
+
+    def abort(self):
+        """Asks an ongoing search to stop as soon as possible"""
+
+        self._is_aborted = True
+
+    def search(self, board, turn, depth=None, timeout=None):
+        """
+        Searches a position until the given depth is reached or the
+        timeout in milliseconds expires. Returns the best move found and
+        its principal variation, or none if there are no legal moves.
+        """
+
+        start_time = time.monotonic()
+        moves = tuple(Oware.get_legal_moves(board, turn))
+        max_depth = min(depth or self.MAX_DEPTH, self.MAX_DEPTH)
+
+        self._nodes = 0
+        self._is_aborted = False
+        self._deadline = timeout and start_time + timeout / 1000
+
+        best_move = moves[0] if moves else None
+        variation = (best_move,) if moves else ()
+
+        for current_depth in range(1, 1 + max_depth):
+            if len(moves) < 2:
+                break
+
+            try:
+                score = self._negamax(board, turn, current_depth,
+                    -self.WIN_SCORE, self.WIN_SCORE, 0)
+            except SearchTimeout:
+                break
+
+            variation = self._get_variation(board, turn, current_depth)
+            best_move = variation[0] if variation else best_move
+
+            if self._callback is not None:
+                elapsed = time.monotonic() - start_time
+                self._callback(current_depth, score,
+                    self._nodes, elapsed, variation)
+
+            if abs(score) >= self.WIN_SCORE - self.MAX_DEPTH:
+                break
+
+        return best_move, variation
+
+    def _negamax(self, board, turn, depth, alpha, beta, ply):
+        """Scores a position for the player to move"""
+
+        self._nodes += 1
+
+        if self._nodes & self.__check_mask == 0:
+            self._check_timeout()
+
+        if board[12] > 24 or board[13] > 24:
+            return self._get_outcome(board[12] - board[13], turn, ply)
+
+        table = self._tables[turn]
+        entry = table.get(board)
+        hash_move = None
+
+        if entry is not None:
+            entry_depth, flag, score, hash_move = entry
+
+            if entry_depth >= depth:
+                score = self._from_table_score(score, ply)
+
+                if flag == self.EXACT:
+                    return score
+
+                if flag == self.LOWER and score >= beta:
+                    return score
+
+                if flag == self.UPPER and score <= alpha:
+                    return score
+
+        moves = list(Oware.get_legal_moves(board, turn))
+
+        if not moves:
+            board = Oware.get_final_board(board)
+            return self._get_outcome(board[12] - board[13], turn, ply)
+
+        if depth == 0:
+            return 100 * turn * (board[12] - board[13])
+
+        if hash_move in moves and moves[0] != hash_move:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+
+        best_score = -self.WIN_SCORE
+        best_move = moves[0]
+        initial_alpha = alpha
+
+        for move in moves:
+            child = Oware.make_move(board, move)
+            score = -self._negamax(child, -turn,
+                depth - 1, -beta, -alpha, ply + 1)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+
+                if score > alpha:
+                    alpha = score
+
+                    if alpha >= beta:
+                        break
+
+        if best_score <= initial_alpha:
+            flag = self.UPPER
+        elif best_score >= beta:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+
+        if len(table) >= self._capacity:
+            table.clear()
+
+        score = self._to_table_score(best_score, ply)
+        table[board] = (depth, flag, score, best_move)
+
+        return best_score
+
+    def _get_outcome(self, difference, turn, ply):
+        """Score of a finished game for the player to move"""
+
+        if difference == 0:
+            return 0
+
+        score = self.WIN_SCORE - ply
+        outcome = score if difference * turn > 0 else -score
+
+        return outcome
+
+    def _to_table_score(self, score, ply):
+        """Makes winning scores relative to the stored position"""
+
+        if score >= self.WIN_SCORE - self.MAX_DEPTH:
+            return score + ply
+
+        if score <= self.MAX_DEPTH - self.WIN_SCORE:
+            return score - ply
+
+        return score
+
+    def _from_table_score(self, score, ply):
+        """Makes stored winning scores relative to the root"""
+
+        if score >= self.WIN_SCORE - self.MAX_DEPTH:
+            return score - ply
+
+        if score <= self.MAX_DEPTH - self.WIN_SCORE:
+            return score + ply
+
+        return score
+
+    def _get_variation(self, board, turn, depth):
+        """Follows the best moves stored on the table"""
+
+        variation = []
+        visited = set()
+
+        while len(variation) < depth and board not in visited:
+            entry = self._tables[turn].get(board)
+
+            if entry is None:
+                break
+
+            visited.add(board)
+            variation.append(entry[3])
+            board = Oware.make_move(board, entry[3])
+            turn = -turn
+
+        return tuple(variation)
+
+    def _check_timeout(self):
+        """Stops the search if it was aborted or ran out of time"""
+
+        if self._is_aborted:
+            raise SearchTimeout()
+
+        if self._deadline and time.monotonic() >= self._deadline:
+            raise SearchTimeout()
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import logging
+
+from threading import Event
+from threading import Lock
+from threading import Thread
+from game import Match
+from game import Oware
+
+from .alphabeta import AlphaBeta
+
+
+class UCIService(object):
+    """
+    Serves the alpha-beta search through the UCI protocol. Commands are
+    read from an input file and each search runs on its own thread, so
+    that a stop or an isready command is answered while it is thinking.
+    If an opening book is given and the client enables it, book moves
+    are played without searching.
+    """
+
+    __name = 'Auale'
+    __author = 'Joan Sala Soler'
+
+    def __init__(self, filein, fileout, book=None):
+        self._book = book
+        self._filein = filein
+        self._fileout = fileout
+        self._logger = logging.getLogger('search')
+        self._searcher = AlphaBeta()
+        self._write_lock = Lock()
+        self._is_stopped = Event()
+        self._thread = None
+        self._options = dict()
+
+        self._turn = Oware.SOUTH
+        self._board = Oware.get_initial_board()
+        self._handlers = self._bind_handlers()
+        self._searcher.set_callback(self._on_iteration)
+
+    def get_option(self, name, default=None):
+        """Value of a configuration option set by the client"""
+
+        return self._options.get(name.lower(), default)
+
+    def run(self):
+        """Evaluates commands until quit is received"""
+
+        try:
+            for line in self._filein:
+                order, _, args = line.strip().partition(' ')
+                handler = self._handlers.get(order)
+
+                if handler is None:
+                    continue
+
+                try:
+                    if handler(args.split()) is False:
+                        break
+                except (ValueError, IndexError):
+                    self._logger.warning(f'Invalid command: { line }')
+        finally:
+            self._stop_search()
+
+    def _bind_handlers(self):
+        """Maps each command order to its evaluation method"""
+
+        handlers = {
+            'uci': self._eval_uci,
+            'isready': self._eval_isready,
+            'setoption': self._eval_setoption,
+            'ucinewgame': self._eval_ucinewgame,
+            'position': self._eval_position,
+            'go': self._eval_go,
+            'stop': self._eval_stop,
+            'ponderhit': self._eval_ponderhit,
+            'quit': self._eval_quit,
+        }
+
+        return handlers
+
+    def _eval_uci(self, args):
+        """Identifies the engine"""
+
+        self._send_response(f'id name { self.__name }')
+        self._send_response(f'id author { self.__author }')
+        self._send_response('option name OwnBook type check default true')
+        self._send_response('uciok')
+
+    def _eval_isready(self, args):
+        """Reports the engine is ready"""
+
+        self._send_response('readyok')
+
+    def _eval_setoption(self, args):
+        """Stores a configuration option"""
+
+        if 'name' in args:
+            index = args.index('name') + 1
+            end = args.index('value') if 'value' in args else len(args)
+            name = ' '.join(args[index:end]).lower()
+            value = ' '.join(args[end + 1:]) or None
+            self._options[name] = value
+
+    def _eval_ucinewgame(self, args):
+        """Forgets what was learned on previous matches"""
+
+        self._stop_search()
+        self._searcher.clear()
+
+    def _eval_position(self, args):
+        """Sets the position to search"""
+
+        self._stop_search()
+
+        board = Oware.get_initial_board()
+        turn = Oware.SOUTH
+
+        if args[:1] == ['fen']:
+            board, turn = Oware.to_position(args[1])
+
+        if 'moves' in args:
+            index = args.index('moves') + 1
+            notation = ''.join(args[index:])
+
+            for move in Oware.to_moves(notation):
+                board = Oware.make_move(board, move)
+                turn = -turn
+
+        self._board = board
+        self._turn = turn
+
+    def _eval_go(self, args):
+        """Starts searching the current position"""
+
+        self._stop_search()
+
+        depth = self._get_argument(args, 'depth')
+        timeout = self._get_argument(args, 'movetime')
+        is_infinite = 'infinite' in args or 'ponder' in args
+
+        if is_infinite is True:
+            depth = timeout = None
+        elif self._is_book_enabled():
+            move = self._find_book_move()
+
+            if move is not None:
+                self._send_response('info string Book move')
+                self._send_bestmove(move, ())
+                return
+
+        self._is_stopped.clear()
+        self._thread = Thread(target=self._search,
+            args=(self._board, self._turn, depth, timeout, is_infinite))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _eval_stop(self, args):
+        """Stops the current search"""
+
+        self._stop_search()
+
+    def _eval_ponderhit(self, args):
+        """Stops pondering and reports the move found so far"""
+
+        self._stop_search()
+
+    def _eval_quit(self, args):
+        """Stops evaluating commands"""
+
+        return False
+
+    def _is_book_enabled(self):
+        """Checks if book moves may be played"""
+
+        is_enabled = self.get_option('OwnBook', 'true') == 'true'
+
+        return self._book is not None and is_enabled
+
+    def _find_book_move(self):
+        """Picks a move from the opening book or none"""
+
+        match = Match(Oware)
+        match.set_position(self._board, self._turn)
+        move = self._book.pick_best_move(match)
+
+        return move
+
+    def _search(self, board, turn, depth, timeout, is_infinite):
+        """Searches a position and reports the best move"""
+
+        move, variation = self._searcher.search(board, turn, depth, timeout)
+
+        if is_infinite is True:
+            self._is_stopped.wait()
+
+        self._send_bestmove(move, variation)
+
+    def _stop_search(self):
+        """Stops the current search and waits for its bestmove"""
+
+        if self._thread is not None:
+            self._is_stopped.set()
+
+            while self._thread.is_alive():
+                self._searcher.abort()
+                self._thread.join(0.01)
+
+            self._thread = None
+
+    def _send_bestmove(self, move, variation):
+        """Reports the best move found and the move to ponder"""
+
+        if move is None:
+            return self._send_response('bestmove 0000')
+
+        notation = Oware.to_move_notation(move)
+        ponder = variation[1] if len(variation) > 1 else None
+
+        if ponder is None:
+            self._send_response(f'bestmove { notation }')
+        else:
+            ponder = Oware.to_move_notation(ponder)
+            self._send_response(f'bestmove { notation } ponder { ponder }')
+
+    def _on_iteration(self, depth, score, nodes, elapsed, variation):
+        """Reports the result of a completed search iteration"""
+
+        time = int(1000 * elapsed)
+        nps = int(nodes / elapsed) if elapsed > 0 else 0
+        pv = Oware.to_moves_notation(variation)
+
+        self._send_response(
+            f'info depth { depth } score cp { score } nodes { nodes } '
+            f'nps { nps } time { time } pv { pv }')
+
+    def _get_argument(self, args, name):
+        """Integer that follows a name on a list of arguments"""
+
+        try:
+            index = args.index(name) + 1
+            value = int(args[index])
+        except (ValueError, IndexError):
+            value = None
+
+        return value
+
+    def _send_response(self, response):
+        """Writes a response to the output file"""
+
+        with self._write_lock:
+            self._fileout.write(f'{ response }\n')
+            self._fileout.flush()
@@ -16,7 +16,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import io
 import re
 
 from game import Oware
@@ -40,11 +39,19 @@ class OGNSerializer(object):
     def dump(self, match, file):
         """Saves a match to a file"""
 
-        self._write_tags(match, file)
+        for line in self.iter_lines(match):
+            file.write(line)
 
-        if len(match.get_moves()) > 0:
-            file.write('\n')
-            self._write_moves(match, file)
+    def dump_all(self, matches, file, encoding='utf-8'):
+        """Saves many matches to a binary file, one after another"""
+
+        separator = b''
+
+        for match in matches:
+            file.write(separator)
+            lines = self.iter_lines(match)
+            file.writelines(line.encode(encoding) for line in lines)
+            separator = b'\n'
 
     def load(self, file):
         """Load a match from a file"""
@@ -54,10 +61,7 @@ class OGNSerializer(object):
     def dumps(self, match):
         """Dumps a match to a string"""
 
-        buffer = io.StringIO()
-        self.dump(match, buffer)
-
-        return buffer.getvalue()
+        return ''.join(self.iter_lines(match))
 
     def loads(self, string):
         """Loads a match from a string"""
@@ -82,6 +86,15 @@ class OGNSerializer(object):
 
         return match
 
+    def iter_lines(self, match):
+        """Yields the lines of a match notation as they are built"""
+
+        yield from self._iter_tags(match)
+
+        if match.get_length() > 0:
+            yield '\n'
+            yield from self._iter_moves(match)
+
     def read_header(self, file, size=None):
         """Reads the OGN header from a file"""
 
@@ -158,37 +171,39 @@ class OGNSerializer(object):
 
         return (variation, index)
 
-    def _write_tags(self, match, file):
-        """Writes this match tags to a file"""
+    def _iter_tags(self, match):
+        """Yields the tag lines of a match"""
 
         tags = dict(match.get_tags())
+        roster = match.get_tag_roster()
 
-        for name in match.get_tag_roster():
+        for name in roster:
             value = self._escape(tags[name])
-            string = '[%s "%s"]\n' % (name, value)
-            file.write(string)
+            yield '[%s "%s"]\n' % (name, value)
 
         for name, value in tags.items():
-            if name not in match.get_tag_roster():
+            if name not in roster:
                 value = self._escape(value)
-                string = '[%s "%s"]\n' % (name, value)
-                file.write(string)
+                yield '[%s "%s"]\n' % (name, value)
 
-    def _write_moves(self, match, file):
-        """Writes moves from a match to a file"""
+    def _iter_moves(self, match):
+        """Yields the move lines of a match wrapped to 80 columns"""
 
-        tokens = match.get_notation()
-        line = str(tokens[0])
+        tokens = match.iter_notation()
+        line = [next(tokens)]
+        length = len(line[0])
 
-        for token in tokens[1:]:
-            if 1 + len(line) + len(token) < 80:
-                line = '%s %s' % (line, token)
+        for token in tokens:
+            if 1 + length + len(token) < 80:
+                length += 1 + len(token)
+                line.append(token)
                 continue
 
-            file.write('%s\n' % line)
-            line = str(token)
+            yield '%s\n' % ' '.join(line)
+            length = len(token)
+            line = [token]
 
-        file.write('%s\n' % line)
+        yield '%s\n' % ' '.join(line)
 
     def _unescape(self, value):
         """Unescapes a tag value"""
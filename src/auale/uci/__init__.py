@@ -1,13 +1,29 @@
 # -*- coding: utf-8 -*-
 
+from .analysis import AnalysisRunner
+from .async_engine import AsyncEngine
 from .client import Client
 from .engine import Engine
 from .human import Human
+from .local_engine import LocalEngine
+from .ranking import RankedReports
 from .strength import Strength
+from .timing import TimeManager
+from .tournament import Contestant
+from .tournament import Tournament
+from .trace import ProtocolTrace
 
 __all__ = [
+    'AnalysisRunner',
+    'AsyncEngine',
     'Client',
+    'Contestant',
     'Engine',
     'Human',
-    'Strength'
+    'LocalEngine',
+    'ProtocolTrace',
+    'RankedReports',
+    'Strength',
+    'TimeManager',
+    'Tournament'
 ]
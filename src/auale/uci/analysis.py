@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import json
+import logging
+import os
+
+from collections import namedtuple
+
+from .async_engine import AsyncEngine
+from .ranking import RankedReports
+from .strength import Strength
+
+Position = namedtuple('Position', (
+    'source',   # Identifier of the analysed match
+    'ply',      # Number of moves played on the match
+    'match',    # Match positioned on the ply
+))
+
+
+class AnalysisRunner(object):
+    """
+    Analyses queued match positions with several engines in parallel.
+    Results are appended to a JSON lines file as soon as each search
+    ends; positions already found on that file are not analysed again,
+    so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, command, path, workers=None):
+        self._command = command
+        self._path = path
+        self._workers = workers or os.cpu_count() or 1
+        self._strength = Strength.HARD
+        self._multipv = 1
+        self._logger = logging.getLogger('uci')
+        self._positions = []
+        self._completed = self._read_completed(path)
+        self._failures = 0
+        self._file = None
+
+    def get_completed_count(self):
+        """Number of positions with a stored analysis"""
+
+        return len(self._completed)
+
+    def get_pending_count(self):
+        """Number of positions queued for analysis"""
+
+        return len(self._positions)
+
+    def get_failure_count(self):
+        """Number of positions the engines could not analyse"""
+
+        return self._failures
+
+    def set_playing_strength(self, strength):
+        """Strength used to configure each engine"""
+
+        self._strength = strength
+
+    def set_multipv(self, count):
+        """Number of candidate moves to store for each position"""
+
+        self._multipv = count
+
+    def add_match(self, match, source):
+        """Queues every position of a match not analysed yet"""
+
+        length = match.get_length()
+
+        for ply in range(length + 1):
+            if (source, ply) not in self._completed:
+                position = self._get_position(match, ply)
+
+                if not position.has_ended():
+                    self._positions.append(Position(source, ply, position))
+
+    def run(self):
+        """Analyses all the queued positions and waits for them"""
+
+        asyncio.run(self.analyse())
+
+    async def analyse(self):
+        """Analyses all the queued positions"""
+
+        queue = asyncio.Queue()
+        workers = min(self._workers, len(self._positions))
+
+        for position in self._positions:
+            queue.put_nowait(position)
+
+        self._positions = []
+
+        with open(self._path, 'a', encoding='utf-8') as file:
+            self._file = file
+            self._end_truncated_line(file)
+            tasks = [self._run_worker(queue) for i in range(workers)]
+            await asyncio.gather(*tasks)
+            self._file = None
+
+    async def _run_worker(self, queue):
+        """Analyses positions from the queue with its own engine"""
+
+        engine = await self._start_engine()
+
+        try:
+            while not queue.empty():
+                position = queue.get_nowait()
+
+                if engine is None:
+                    engine = await self._start_engine()
+
+                if not await self._analyse_position(engine, position):
+                    self._failures += 1
+                    await engine.quit()
+                    engine = None
+        finally:
+            if engine is not None:
+                await engine.quit()
+
+    async def _start_engine(self):
+        """Starts a new engine process configured for analysis"""
+
+        engine = AsyncEngine(self._command)
+        await engine.start()
+        engine.set_playing_strength(self._strength)
+
+        if self._multipv > 1:
+            engine.set_multipv(self._multipv)
+
+        return engine
+
+    async def _analyse_position(self, engine, position):
+        """Searches a position and stores the result"""
+
+        reports = RankedReports()
+        callback = lambda e, report: reports.update(report)
+        handler = engine.connect('info-received', callback)
+
+        try:
+            await engine.start_new_match(position.match)
+            bestmove = await engine.start_thinking(position.match)
+        finally:
+            engine.disconnect(handler)
+
+        if bestmove is None or bestmove.move is None:
+            self._logger.warning(f'Cannot analyse { position.source }')
+            return False
+
+        result = self._to_result(position, bestmove, reports)
+        self._write_result(result)
+
+        return True
+
+    def _to_result(self, position, bestmove, reports):
+        """Builds a serializable result for a position"""
+
+        match = position.match
+        game = match.get_game()
+        board = match.get_board()
+        turn = match.get_turn()
+        report = reports.get_report(1)
+
+        result = {
+            'source': position.source,
+            'ply': position.ply,
+            'position': game.to_board_notation(board, turn),
+            'move': bestmove.move,
+            'ponder': bestmove.ponder,
+            'depth': report and report.depth,
+            'cp': report and report.cp,
+            'mate': report and report.mate,
+            'pv': report and report.pv
+        }
+
+        if self._multipv > 1:
+            ranking = reports.get_ranking()
+            result['lines'] = [self._to_line(r) for r in ranking]
+
+        return result
+
+    def _to_line(self, report):
+        """Builds a serializable candidate line from a report"""
+
+        line = {
+            'rank': report.multipv or 1,
+            'depth': report.depth,
+            'cp': report.cp,
+            'mate': report.mate,
+            'pv': report.pv
+        }
+
+        return line
+
+    def _get_position(self, match, ply):
+        """Copy of a match positioned on the given ply"""
+
+        position = match.clone()
+        position.undo_all_moves()
+
+        for index in range(ply):
+            position.redo_last_move()
+
+        return position
+
+    def _write_result(self, result):
+        """Appends a result to the results file"""
+
+        key = (result['source'], result['ply'])
+        line = json.dumps(result, ensure_ascii=False)
+        self._file.write(f'{ line }\n')
+        self._file.flush()
+        self._completed.add(key)
+
+    def _end_truncated_line(self, file):
+        """Ensures results are not appended to a truncated line"""
+
+        if file.tell() > 0:
+            with open(self._path, 'rb') as reader:
+                reader.seek(-1, os.SEEK_END)
+
+                if reader.read(1) != b'\n':
+                    file.write('\n')
+
+    def _read_completed(self, path):
+        """Keys of the positions stored on a results file"""
+
+        completed = set()
+
+        if not os.path.isfile(path):
+            return completed
+
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    result = json.loads(line)
+                    completed.add((result['source'], result['ply']))
+                except (ValueError, KeyError, TypeError):
+                    self._logger.warning('Ignoring truncated result')
+
+        return completed
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class CommandArguments(object):
+    """
+    Builds the arguments of the UCI position and go commands. Classes
+    that inherit from it must provide the search depth and timeout.
+    The last position arguments are remembered, so that a position
+    extending the previous one is built from the new moves only. If
+    a time manager is set, it allocates the timeout of each search.
+    """
+
+    _sent_position = None
+    _sent_board = None
+    _sent_moves = ()
+    _sent_notation = None
+    _sent_timeout = None
+    _time_manager = None
+
+    def _get_search_arguments(self, match=None):
+        """Builds the arguments for the go command"""
+
+        options = []
+        timeout = self._get_search_timeout(match)
+        self._sent_timeout = timeout
+
+        if self._search_depth is not None:
+            options.append('depth')
+            options.append(self._search_depth)
+
+        if timeout is not None:
+            options.append('movetime')
+            options.append(timeout)
+
+        if not options:
+            options.append('infinite')
+
+        return self._to_string(options)
+
+    def _get_search_timeout(self, match=None):
+        """Milliseconds to search the given match"""
+
+        timeout = self._search_timeout
+        manager = self._time_manager
+
+        if None not in (timeout, manager, match):
+            timeout = manager.allocate(match, timeout)
+
+        return timeout
+
+    def _update_time_manager(self, report):
+        """Feeds a search report to the time manager if any"""
+
+        if self._time_manager is not None:
+            self._time_manager.update(report)
+
+    def _finish_time_manager(self):
+        """Notifies the time manager that a search ended"""
+
+        if self._time_manager is not None:
+            self._time_manager.finish()
+
+    def _get_board_argument(self, match, index):
+        """Obtains a board notation for the given match index"""
+
+        position = match.get_position(index)
+
+        if position == self._sent_position:
+            return self._sent_board
+
+        options = 'startpos'
+        game = match.get_game()
+
+        if position[0] != game.get_initial_board():
+            options = game.to_board_notation(*position)
+            options = f'fen { options }'
+
+        self._sent_position = position
+        self._sent_board = options
+
+        return options
+
+    def _get_position_arguments(self, match, move=None):
+        """Builds the arguments for the position command"""
+
+        options = []
+
+        index = match.get_capture_index()
+        board = self._get_board_argument(match, index)
+        moves = self._get_moves_argument(match, index, move)
+
+        options.append(board)
+        options.append(moves)
+
+        return self._to_string(options)
+
+    def _get_moves_argument(self, match, index, move=None):
+        """Obtains a moves notation for the given match index"""
+
+        options = None
+
+        length = match.get_current_index()
+        moves = match.get_moves()[index:length]
+
+        if isinstance(move, int):
+            moves = moves + (move,)
+
+        if moves and len(moves) > 0:
+            game = match.get_game()
+            notation = self._get_moves_notation(game, moves)
+            options = f'moves { notation }'
+
+        return options
+
+    def _get_moves_notation(self, game, moves):
+        """
+        Converts moves to their notation. If the moves extend the ones
+        of the last position command, only the new moves are converted.
+        """
+
+        sent = self._sent_moves
+        count = len(sent)
+
+        if moves[:count] == sent and self._sent_notation:
+            notation = game.to_moves_notation(moves[count:])
+            notation = f'{ self._sent_notation }{ notation }'
+        else:
+            notation = game.to_moves_notation(moves)
+
+        self._sent_moves = moves
+        self._sent_notation = notation
+
+        return notation
+
+    def _to_string(self, options):
+        """Converts an iterable into a string"""
+
+        parts = (o for o in options if o is not None)
+        string = ' '.join((str(o) for o in parts))
+
+        return string
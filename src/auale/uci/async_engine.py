@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import math
+
+from gi.repository import GObject
+
+from .arguments import CommandArguments
+from .rules import parser
+from .strength import Strength
+from .trace import ProtocolTrace
+
+
+class AsyncEngine(GObject.GObject, CommandArguments):
+    """
+    Client for an external UCI engine driven by an asyncio event loop.
+    Engine responses are read by a task instead of a thread, so a single
+    loop can drive many engine processes at once.
+    """
+
+    __gtype_name__ = 'AsyncEngine'
+    __counter = 0
+    __quit_timeout = 8.0
+    __response_timeout = 8.0
+
+    def __init__(self, command):
+        GObject.GObject.__init__(self)
+        AsyncEngine.__counter += 1
+
+        self._id = AsyncEngine.__counter
+        self._command = command
+        self._logger = logging.getLogger('uci')
+        self._trace = ProtocolTrace.open_default()
+        self._process = None
+        self._reader = None
+        self._bestmove = None
+        self._is_running = None
+        self._is_ready = None
+        self._is_terminated = None
+
+        self._handlers = self._bind_handlers()
+        self._match = None
+        self._search_depth = 10
+        self._search_timeout = 1000
+        self._ponder_move = None
+        self._multipv = 1
+
+        self._strength = Strength.EASY
+        self._author = 'Unknown author'
+        self._name = 'Unknown engine'
+
+    @GObject.Signal
+    def id_received(self, params: object):
+        """Emitted when a player identified itself"""
+
+    @GObject.Signal
+    def info_received(self, params: object):
+        """Emitted when a player report is received"""
+
+    @GObject.Signal
+    def option_received(self, params: object):
+        """Emitted when a configuration option is received"""
+
+    @GObject.Signal
+    def move_received(self, params: object):
+        """Emitted when a best move report is received"""
+
+    @GObject.Signal
+    def response_timeout(self, order: str):
+        """Emitted when waiting for a response times out"""
+
+    @GObject.Signal(flags=GObject.SignalFlags.RUN_LAST)
+    def failure(self, reason: str):
+        """Emitted on client failures"""
+
+    @GObject.Signal(flags=GObject.SignalFlags.RUN_LAST)
+    def termination(self):
+        """Emitted when the client is stopped"""
+
+    def get_player_name(self):
+        """Returns this engine name"""
+
+        return self._name
+
+    def get_author_name(self):
+        """Returns this engine's author"""
+
+        return self._author
+
+    def get_playing_strength(self):
+        """Returns the current playing strength"""
+
+        return self._strength
+
+    def get_current_match(self):
+        """Last match the engine was asked to search on"""
+
+        return self._match
+
+    def get_move_number(self):
+        """Move number of the match we are searching on"""
+
+        index = 1 + self._match.get_current_index()
+        number = math.ceil(index / 2)
+
+        return number
+
+    def get_ponder_move(self):
+        """Notation of the move the player was pondering on"""
+
+        move = self._ponder_move
+        game = self._match.get_game()
+        notation = move and game.to_move_notation(move)
+
+        return notation
+
+    def is_searching(self):
+        """Checks if the engine is thinking or pondering"""
+
+        return self._bestmove is not None and not self._bestmove.done()
+
+    def set_search_depth(self, depth):
+        """Sets how many plies the player may search"""
+
+        self._search_depth = depth
+
+    def set_search_timeout(self, milliseconds):
+        """Sets how many milliseconds a search may take"""
+
+        self._search_timeout = milliseconds
+
+    def get_time_manager(self):
+        """Time manager that allocates the search timeouts or none"""
+
+        return self._time_manager
+
+    def set_time_manager(self, manager):
+        """Sets a time manager to allocate the search timeouts"""
+
+        self._time_manager = manager
+
+    def get_multipv(self):
+        """Number of principal variations the engine reports"""
+
+        return self._multipv
+
+    def set_multipv(self, count):
+        """Sets how many principal variations the engine reports"""
+
+        self._multipv = count
+        self.set_option('MultiPV', count)
+
+    def set_playing_strength(self, strength):
+        """Configures the strength of the engine"""
+
+        self.set_search_depth(strength.search_depth)
+        self.set_search_timeout(strength.search_timeout)
+        self.set_book_search(strength.allows_book_search)
+        self._strength = strength
+
+    def set_book_search(self, enabled):
+        """Enables or disables the engine's opening book"""
+
+        self.set_option('OwnBook', 'true' if enabled else 'false')
+
+    def set_option(self, name, value=None):
+        """Sends a configuration parameter to the engine"""
+
+        param = '' if value is None else f' value { value }'
+        command = f'setoption name { name }{ param }'
+        self._send_command(command)
+
+    async def start(self):
+        """Starts the engine process in UCI mode"""
+
+        self._is_ready = asyncio.Event()
+        self._is_running = asyncio.Event()
+        self._is_terminated = asyncio.Event()
+        self._process = await self._create_process(self._command)
+        self._reader = asyncio.ensure_future(self._run())
+
+        self._send_command('uci')
+        await self._drain()
+        await self._wait_for('uci', self._is_running.wait())
+
+        if not self._is_running.is_set():
+            self.failure.emit('Engine is not responding')
+
+    async def start_new_match(self, match=None):
+        """Notify the player a new match will start"""
+
+        if not self.is_searching():
+            if match != self._match or not self._match:
+                self._send_command('ucinewgame')
+                await self._synchronize()
+
+    async def start_thinking(self, match):
+        """Searches the given match and returns the best move report"""
+
+        await self.stop_thinking()
+
+        self._match = match
+        self._ponder_move = None
+        search_args = self._get_search_arguments(match)
+        position_args = self._get_position_arguments(match)
+        limit = self._get_bestmove_limit()
+        self._bestmove = self._create_future()
+        self._send_command(f'position { position_args }')
+        self._send_command(f'go { search_args }')
+        await self._drain()
+
+        return await self._wait_for_bestmove(limit)
+
+    async def start_pondering(self, match, move=None):
+        """Ponders the given match until it is asked to stop"""
+
+        await self.stop_thinking()
+
+        self._match = match
+        self._ponder_move = move
+        position_args = self._get_position_arguments(match, move)
+        self._bestmove = self._create_future()
+        self._send_command(f'position { position_args }')
+        self._send_command('go ponder')
+        await self._drain()
+
+        return await self._wait_for_bestmove()
+
+    async def stop_thinking(self):
+        """Asks the player to stop thinking"""
+
+        if self.is_searching():
+            self._send_command('stop')
+            await self._drain()
+            await self._wait_for('stop', asyncio.shield(self._bestmove))
+
+    async def quit(self):
+        """Asks the player to quit and waits for its process to exit"""
+
+        if self._process is None:
+            return
+
+        if not self._is_terminated.is_set():
+            self._send_command('quit')
+            await self._drain()
+            await self._wait_for('quit', self._is_terminated.wait())
+
+        try:
+            wait = self._process.wait()
+            await asyncio.wait_for(wait, self.__quit_timeout)
+        except asyncio.TimeoutError:
+            self.failure.emit('Quit timeout')
+            await self._terminate_process()
+
+    def _bind_handlers(self):
+        """Maps each response order to its evaluation method"""
+
+        orders = parser.orders
+        handlers = {o: getattr(self, f'_eval_{ o }') for o in orders}
+
+        return handlers
+
+    def _eval_uciok(self, params):
+        """Evaluates a uciok response"""
+
+        if not self._is_running.is_set():
+            self._is_running.set()
+
+    def _eval_readyok(self, params):
+        """Evaluates a readyok response"""
+
+        if not self._is_ready.is_set():
+            self._is_ready.set()
+
+    def _eval_info(self, params):
+        """Evaluates a info response"""
+
+        if self._is_running.is_set() and self._match:
+            params.number = self.get_move_number()
+            params.ponder = self.get_ponder_move()
+            self._update_time_manager(params)
+            self.info_received.emit(params)
+
+    def _eval_id(self, params):
+        """Evaluates an id response"""
+
+        if not self._is_running.is_set():
+            if isinstance(params.author, str):
+                self._author = params.author
+
+            if isinstance(params.name, str):
+                self._name = params.name
+
+            self.id_received.emit(params)
+
+    def _eval_option(self, params):
+        """Evaluates an option response"""
+
+        if not self._is_running.is_set():
+            self.option_received.emit(params)
+
+    def _eval_bestmove(self, params):
+        """Evaluates a bestmove response"""
+
+        if self.is_searching():
+            self._finish_time_manager()
+            self._bestmove.set_result(params)
+            self.move_received.emit(params)
+
+    def _create_future(self):
+        """Creates a future on the running event loop"""
+
+        return asyncio.get_running_loop().create_future()
+
+    async def _create_process(self, command):
+        """Creates an engine subprocess"""
+
+        return await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE
+        )
+
+    async def _terminate_process(self):
+        """Ensures the engine process is terminated"""
+
+        try:
+            self._logger.warning('Terminating engine')
+            self._process.terminate()
+            wait = self._process.wait()
+            await asyncio.wait_for(wait, self.__quit_timeout)
+        except asyncio.TimeoutError:
+            self._logger.warning('Killing engine')
+            self._process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _synchronize(self):
+        """Synchronize player responses"""
+
+        self._is_ready.clear()
+        self._send_command('isready')
+        await self._drain()
+        await self._wait_for('isready', self._is_ready.wait())
+
+    def _get_bestmove_limit(self):
+        """Seconds to wait for the best move of a timed search"""
+
+        if self._sent_timeout is None:
+            return None
+
+        limit = self._sent_timeout / 1000.0 + self.__response_timeout
+
+        return limit
+
+    async def _wait_for_bestmove(self, limit=None):
+        """Waits for the current search to report a best move"""
+
+        params = None
+
+        if self._bestmove is not None:
+            if self._is_terminated.is_set() and not self._bestmove.done():
+                self._bestmove.set_result(None)
+
+            try:
+                bestmove = asyncio.shield(self._bestmove)
+                params = await asyncio.wait_for(bestmove, limit)
+            except asyncio.TimeoutError:
+                params = await self._on_bestmove_timeout()
+
+        return params
+
+    async def _on_bestmove_timeout(self):
+        """Stops a search that did not report a best move in time"""
+
+        self._logger.warning('Best move timeout')
+        self._send_command('stop')
+        await self._wait_for('bestmove', asyncio.shield(self._bestmove))
+
+        if not self._bestmove.done():
+            self._bestmove.set_result(None)
+
+        return self._bestmove.result()
+
+    async def _wait_for(self, order, awaitable):
+        """Waits for an awaitable with the response timeout"""
+
+        try:
+            await asyncio.wait_for(awaitable, self.__response_timeout)
+        except asyncio.TimeoutError:
+            if not self._is_terminated.is_set():
+                self._logger.warning('Response timeout')
+                self.response_timeout.emit(order)
+                await self._on_response_timeout()
+
+    async def _on_response_timeout(self):
+        """Terminates the engine if it stopped responding"""
+
+        if self._process.returncode is None:
+            self.failure.emit('Response timeout')
+            await self._terminate_process()
+
+    def _eval_response(self, response):
+        """Evaluates a received response"""
+
+        try:
+            params = parser.parse(response)
+            callback = self._handlers[params.order]
+            callback(params)
+        except BaseException as e:
+            self._logger.warning('Unknown UCI response')
+
+    async def _read_response(self):
+        """Reads a response from the engine's output"""
+
+        line = await self._process.stdout.readline()
+        response = line.decode('utf-8').strip() if line else None
+        self._logger.debug(f'{ self } < { response }')
+
+        if self._trace is not None and response is not None:
+            self._trace.response(response)
+
+        return response
+
+    def _send_command(self, command):
+        """Writes a command to the engine's input"""
+
+        try:
+            self._logger.debug(f'{ self } > { command }')
+
+            if self._trace is not None:
+                self._trace.command(command)
+
+            self._process.stdin.write(f'{ command }\n'.encode('utf-8'))
+        except (BrokenPipeError, ConnectionResetError):
+            if not self._is_terminated.is_set():
+                self.failure.emit('Broken pipe')
+
+    async def _drain(self):
+        """Waits until the engine's input buffer is flushed"""
+
+        try:
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            if not self._is_terminated.is_set():
+                self.failure.emit('Broken pipe')
+
+    async def _run(self):
+        """Evaluates responses while the engine output is open"""
+
+        try:
+            while True:
+                response = await self._read_response()
+                if response is None: break
+                if response: self._eval_response(response)
+        finally:
+            self._is_running.clear()
+            self._is_terminated.set()
+
+            if self.is_searching():
+                self._bestmove.set_result(None)
+
+            self.termination.emit()
+
+            if self._trace is not None:
+                self._trace.close()
+
+    def __repr__(self):
+        return '<AsyncEngine({0}, {1})>'.format(self._id, self._name)
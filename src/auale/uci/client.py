@@ -20,15 +20,23 @@ import logging
 import math
 import re
 import sys
+import time
 
+from concurrent.futures import Future
+from concurrent.futures import wait
 from threading import Event
+from threading import Lock
+from threading import RLock
 from threading import Thread
+from threading import Timer
 from gi.repository import GObject
 
+from .arguments import CommandArguments
 from .rules import parser
+from .trace import ProtocolTrace
 
 
-class Client(GObject.GObject, Thread):
+class Client(GObject.GObject, Thread, CommandArguments):
     """UCI protocol client implementation."""
 
     __gtype_name__ = 'Client'
@@ -42,15 +50,28 @@ class Client(GObject.GObject, Thread):
         self._filein = filein
 
         self._logger = logging.getLogger('uci')
+        self._trace = ProtocolTrace.open_default()
         self._is_waiting = Event()
         self._is_terminated = Event()
         self._is_running = Event()
         self._is_ready = Event()
+        self._state_lock = RLock()
+        self._write_lock = Lock()
 
+        self._deferred = []
+        self._stop_future = None
+        self._quit_future = None
+        self._stop_time = None
+        self._quit_time = None
+        self._idle_latency = None
+
+        self._handlers = self._bind_handlers()
         self._match = None
         self._search_depth = 10
         self._search_timeout = 1000
         self._ponder_move = None
+        self._request = None
+        self._multipv = 1
 
     @GObject.Signal
     def id_received(self, params: object):
@@ -88,6 +109,11 @@ class Client(GObject.GObject, Thread):
 
         return running and not waiting
 
+    def get_idle_latency(self):
+        """Seconds the last stop request took to leave the engine idle"""
+
+        return self._idle_latency
+
     def get_current_match(self):
         """Last match the engine was asked to search on"""
 
@@ -120,6 +146,27 @@ class Client(GObject.GObject, Thread):
 
         self._search_timeout = milliseconds
 
+    def get_time_manager(self):
+        """Time manager that allocates the search timeouts or none"""
+
+        return self._time_manager
+
+    def set_time_manager(self, manager):
+        """Sets a time manager to allocate the search timeouts"""
+
+        self._time_manager = manager
+
+    def get_multipv(self):
+        """Number of principal variations the engine reports"""
+
+        return self._multipv
+
+    def set_multipv(self, count):
+        """Sets how many principal variations the engine reports"""
+
+        self._multipv = count
+        self.set_option('MultiPV', count)
+
     def set_option(self, name, value=None):
         """Sends a configuration parameter to the engine"""
 
@@ -143,19 +190,49 @@ class Client(GObject.GObject, Thread):
     def start_new_match(self, match=None):
         """Notify the player a new match will start"""
 
-        if self._is_waiting.is_set():
-            if match != self._match or not self._match:
+        if match != self._match or not self._match:
+            if self._defer_while_stopping(self._send_command, 'ucinewgame'):
+                return
+
+            if self._is_waiting.is_set():
                 self._send_command('ucinewgame')
                 self._synchronize()
 
-    def start_thinking(self, match):
-        """Asks the player to start thinking on the given match"""
+    def reset(self):
+        """Stops any search and clears the engine's match state"""
+
+        is_ready = False
+        future = self.stop_thinking()
+        wait([future], self.__response_timeout)
+
+        if self._is_waiting.is_set():
+            self._match = None
+            self._ponder_move = None
+
+            if self._multipv != 1:
+                self.set_multipv(1)
+
+            self._send_command('ucinewgame')
+            self._synchronize()
+            is_ready = self._is_ready.is_set()
+
+        return is_ready
+
+    def start_thinking(self, match, request=None):
+        """
+        Asks the player to start thinking on the given match. The best
+        move received for the search carries the request identifier.
+        """
+
+        if self._defer_while_stopping(self.start_thinking, match, request):
+            return
 
         if self._is_waiting.is_set():
             self._match = match
             self._is_waiting.clear()
             self._ponder_move = None
-            search_args = self._get_search_arguments()
+            self._request = request
+            search_args = self._get_search_arguments(match)
             position_args = self._get_position_arguments(match)
             self._send_command(f'position { position_args }')
             self._send_command(f'go { search_args }')
@@ -163,27 +240,61 @@ class Client(GObject.GObject, Thread):
     def start_pondering(self, match, move=None):
         """Asks the player to start pondering on the given match"""
 
+        if self._defer_while_stopping(self.start_pondering, match, move):
+            return
+
         if self._is_waiting.is_set():
             self._match = match
             self._is_waiting.clear()
             self._ponder_move = move
+            self._request = None
             position_args = self._get_position_arguments(match, move)
             self._send_command(f'position { position_args }')
             self._send_command('go ponder')
 
     def stop_thinking(self):
-        """Asks the player to stop thinking"""
+        """
+        Asks the player to stop thinking without waiting for it. Returns
+        a future that resolves to the seconds it took the engine to become
+        idle. Searches requested meanwhile are started after it stops.
+        """
 
-        if not self._is_waiting.is_set():
-            self._send_command('stop')
-            self._wait_for('stop', self._is_waiting)
+        with self._state_lock:
+            self._deferred.clear()
+            future = self._stop_future
+
+            if future is None and not self._is_waiting.is_set():
+                future = self._stop_future = Future()
+                self._stop_time = time.monotonic()
+                self._start_timer('stop', future)
+                self._send_command('stop')
+
+        return future or self._resolved_future(0.0)
 
     def quit(self):
-        """Asks the player to quit"""
+        """
+        Asks the player to quit without waiting for it. Returns a future
+        that resolves to the seconds it took the client to terminate.
+        """
 
-        if not self._is_terminated.is_set():
-            self._send_command('quit')
-            self._wait_for('quit', self._is_terminated)
+        with self._state_lock:
+            future = self._quit_future
+
+            if future is None and not self._is_terminated.is_set():
+                future = self._quit_future = Future()
+                self._quit_time = time.monotonic()
+                self._start_timer('quit', future)
+                self._send_command('quit')
+
+        return future or self._resolved_future(0.0)
+
+    def _bind_handlers(self):
+        """Maps each response order to its evaluation method"""
+
+        orders = parser.orders
+        handlers = {o: getattr(self, f'_eval_{ o }') for o in orders}
+
+        return handlers
 
     def _eval_uciok(self, params):
         """Evaluates a uciok response"""
@@ -202,8 +313,10 @@ class Client(GObject.GObject, Thread):
         """Evaluates a info response"""
 
         if self._is_running.is_set():
-            params['number'] = self.get_move_number()
-            params['ponder'] = self.get_ponder_move()
+            params.number = self.get_move_number()
+            params.ponder = self.get_ponder_move()
+            params.request = self._request
+            self._update_time_manager(params)
             self.info_received.emit(params)
 
     def _eval_id(self, params):
@@ -221,80 +334,64 @@ class Client(GObject.GObject, Thread):
     def _eval_bestmove(self, params):
         """Evaluates a bestmove response"""
 
-        if not self._is_waiting.is_set():
-            self.move_received.emit(params)
-            self._is_waiting.set()
-
-    def _get_search_arguments(self):
-        """Builds the arguments for the go command"""
-
-        options = []
-
-        if self._search_depth is not None:
-            options.append('depth')
-            options.append(self._search_depth)
-
-        if self._search_timeout is not None:
-            options.append('movetime')
-            options.append(self._search_timeout)
-
-        if not options:
-            options.append('infinite')
-
-        return self._to_string(options)
+        with self._state_lock:
+            if self._is_waiting.is_set():
+                return
 
-    def _get_board_argument(self, match, index):
-        """Obtains a board notation for the given match index"""
-
-        options = 'startpos'
-        position = match.get_positions()[index]
-        game = match.get_game()
-
-        if position[0] != game.get_initial_board():
-            options = game.to_board_notation(*position)
-            options = f'fen { options }'
+            self._is_waiting.set()
+            self._finish_time_manager()
+            params.request = self._request
+            future, self._stop_future = self._stop_future, None
+            deferred, self._deferred = self._deferred, []
 
-        return options
+        if future is None:
+            self.move_received.emit(params)
+        else:
+            self._resolve_stop_future(future)
 
-    def _get_position_arguments(self, match, move=None):
-        """Builds the arguments for the position command"""
+        for callback, args in deferred:
+            callback(*args)
 
-        options = []
+    def _defer_while_stopping(self, callback, *args):
+        """Defers a call until a pending stop completes"""
 
-        index = match.get_capture_index()
-        board = self._get_board_argument(match, index)
-        moves = self._get_moves_argument(match, index, move)
+        with self._state_lock:
+            is_stopping = self._stop_future is not None
 
-        options.append(board)
-        options.append(moves)
+            if is_stopping is True:
+                self._deferred.append((callback, args))
 
-        return self._to_string(options)
+        return is_stopping
 
-    def _get_moves_argument(self, match, index, move=None):
-        """Obtains a moves notation for the given match index"""
+    def _resolve_stop_future(self, future):
+        """Records the time to idle and resolves a stop request"""
 
-        options = None
+        self._idle_latency = time.monotonic() - self._stop_time
+        self._logger.debug(f'{ self } idle in { self._idle_latency:.3f}s')
+        future.set_result(self._idle_latency)
 
-        length = match.get_current_index()
-        moves = match.get_moves()[index:length]
+    def _resolved_future(self, result):
+        """A future that is already done"""
 
-        if isinstance(move, int):
-            moves = moves + (move,)
+        future = Future()
+        future.set_result(result)
 
-        if moves and len(moves) > 0:
-            game = match.get_game()
-            notation = game.to_moves_notation(moves)
-            options = f'moves { notation }'
+        return future
 
-        return options
+    def _start_timer(self, order, future):
+        """Emits a response timeout if the future is not done in time"""
 
-    def _to_string(self, options):
-        """Converts an iterable into a string"""
+        args = (order, future)
+        timer = Timer(self.__response_timeout, self._on_timer, args)
+        timer.daemon = True
+        timer.start()
 
-        parts = (o for o in options if o is not None)
-        string = ' '.join((str(o) for o in parts))
+    def _on_timer(self, order, future):
+        """Notifies a response timeout for a pending request"""
 
-        return string
+        if not future.done() and not self._is_terminated.is_set():
+            self._logger.warning('Response timeout')
+            self.response_timeout.emit(order)
 
     def _synchronize(self):
         """Synchronize player responses"""
@@ -316,8 +413,7 @@ class Client(GObject.GObject, Thread):
 
         try:
             params = parser.parse(response)
-            method_name = f'_eval_{ params["order"] }'
-            callback = getattr(self, method_name)
+            callback = self._handlers[params.order]
             callback(params)
         except BaseException as e:
             self._logger.warning('Unknown UCI response')
@@ -328,6 +424,9 @@ class Client(GObject.GObject, Thread):
         try:
             response = self._filein.readline().strip()
             self._logger.debug(f'{ self } < { response }')
+
+            if self._trace is not None and response:
+                self._trace.response(response)
         except BrokenPipeError:
             if not self._is_terminated.is_set():
                 self.failure.emit('Broken pipe')
@@ -338,9 +437,14 @@ class Client(GObject.GObject, Thread):
         """Writes a command to the output file"""
 
         try:
-            self._logger.debug(f'{ self } > { command }')
-            self._fileout.write(f'{ command }\n')
-            self._fileout.flush()
+            with self._write_lock:
+                self._logger.debug(f'{ self } > { command }')
+
+                if self._trace is not None:
+                    self._trace.command(command)
+
+                self._fileout.write(f'{ command }\n')
+                self._fileout.flush()
         except BrokenPipeError:
             if not self._is_terminated.is_set():
                 self.failure.emit('Broken pipe')
@@ -357,3 +461,21 @@ class Client(GObject.GObject, Thread):
             self._is_running.clear()
             self._is_terminated.set()
             self.termination.emit()
+            self._resolve_pending_futures()
+
+            if self._trace is not None:
+                self._trace.close()
+
+    def _resolve_pending_futures(self):
+        """Completes any stop or quit request once terminated"""
+
+        with self._state_lock:
+            self._deferred.clear()
+            stop_future, self._stop_future = self._stop_future, None
+            quit_future = self._quit_future
+
+        if stop_future is not None:
+            self._resolve_stop_future(stop_future)
+
+        if quit_future is not None and not quit_future.done():
+            quit_future.set_result(time.monotonic() - self._quit_time)
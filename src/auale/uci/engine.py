@@ -20,6 +20,7 @@ import subprocess
 
 from .client import Client
 from .strength import Strength
+from .timing import TimeManager
 
 
 class Engine(Client):
@@ -35,10 +36,12 @@ class Engine(Client):
         Engine.__counter += 1
 
         self._id = Engine.__counter
+        self._command = command
         self._process = process
         self._strength = Strength.EASY
         self._author = 'Unknown author'
         self._name = 'Unknown engine'
+        self.set_time_manager(TimeManager())
         self.connect('id-received', self._on_id_received)
         self.connect('response-timeout', self._on_response_timeout)
         self.connect('termination', self._on_termination)
@@ -59,6 +62,25 @@ class Engine(Client):
 
         return self._strength
 
+    def is_healthy(self):
+        """Checks if the engine process and its reader are running"""
+
+        is_running = self._process.poll() is None
+        is_reading = self.is_alive() and not self._is_terminated.is_set()
+
+        return is_running and is_reading
+
+    def get_command(self):
+        """Command used to start this engine"""
+
+        return self._command
+
+    def terminate(self):
+        """Forcibly terminates the engine process"""
+
+        if self._process.poll() is None:
+            self._terminate_process()
+
     def set_playing_strength(self, strength):
         """Configures the strength of the engine"""
 
@@ -75,11 +97,11 @@ class Engine(Client):
     def _on_id_received(self, client, args):
         """Listens for identification messages"""
 
-        if isinstance(args['author'], str):
-            self._author = args['author']
+        if isinstance(args.author, str):
+            self._author = args.author
 
-        if isinstance(args['name'], str):
-            self._name = args['name']
+        if isinstance(args.name, str):
+            self._name = args.name
 
     def _on_response_timeout(self, client, command):
         """Listens for response timeouts"""
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import subprocess
+
+from threading import Thread
+from search import UCIService
+
+from .engine import Engine
+
+
+class ServiceProcess(object):
+    """
+    Runs the built-in UCI service on a thread behind a pair of pipes.
+    It offers the subset of the subprocess interface the engine uses,
+    so the service is driven exactly like an external engine.
+    """
+
+    def __init__(self, command):
+        command_in, command_out = os.pipe()
+        response_in, response_out = os.pipe()
+
+        self.args = command
+        self.pid = None
+        self.returncode = None
+        self.stdin = open(command_out, 'w', encoding='utf-8')
+        self.stdout = open(response_in, 'r', encoding='utf-8')
+
+        self._filein = open(command_in, 'r', encoding='utf-8')
+        self._fileout = open(response_out, 'w', encoding='utf-8')
+        self._service = UCIService(self._filein, self._fileout)
+        self._thread = Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def poll(self):
+        """Exit code of the service or none if it is running"""
+
+        return self.returncode
+
+    def wait(self, timeout=None):
+        """Waits for the service to exit"""
+
+        self._thread.join(timeout)
+
+        if self._thread.is_alive():
+            raise subprocess.TimeoutExpired(self.args, timeout)
+
+        return self.returncode
+
+    def terminate(self):
+        """Closes the command pipe so the service exits"""
+
+        try:
+            self.stdin.close()
+        except OSError:
+            pass
+
+    def kill(self):
+        """Closes the command pipe so the service exits"""
+
+        self.terminate()
+
+    def _run(self):
+        """Serves commands until the service quits"""
+
+        try:
+            self._service.run()
+        finally:
+            self._filein.close()
+            self._fileout.close()
+            self.returncode = 0
+
+
+class LocalEngine(Engine):
+    """
+    Engine that searches in-process with the built-in alpha-beta search.
+    It is used when no external engine can be started.
+    """
+
+    __gtype_name__ = 'LocalEngine'
+
+    COMMAND = ('[builtin]',)
+
+    def __init__(self, command=COMMAND):
+        Engine.__init__(self, command)
+
+    def _create_process(self, command):
+        """Starts the built-in search service"""
+
+        return ServiceProcess(command)
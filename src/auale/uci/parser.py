@@ -18,34 +18,52 @@
 
 import re
 
+
 class Parser(object):
-    """Parses commands into plain dictionaries."""
+    """
+    Parses engine responses into typed records. Each rule is compiled
+    into a single regular expression and responses are dispatched to it
+    by their first token, so only one expression is tried per line. The
+    groups of each expression must follow the fields of its record.
+    """
 
     def __init__(self, rules):
         self._skip = r'\S*'
         self._stop = r'(?:\s+|$)'
         self._patterns = self._compile_rules(rules)
 
+    @property
+    def orders(self):
+        """Response orders this parser recognizes"""
+
+        return tuple(self._patterns.keys())
+
     def parse(self, line):
-        """Converts a string into a dictionary of values"""
+        """Converts a string into a record or none if not valid"""
 
-        haystack = line.split('\n', 1)[0]
-        haystack = haystack.strip()
+        haystack = line.partition('\n')[0].strip()
+        order = haystack.split(None, 1)[0] if haystack else None
+        rule = self._patterns.get(order)
 
-        for pattern in self._patterns:
+        if rule is not None:
+            record, pattern = rule
             match = pattern.match(haystack)
-            if match: return match.groupdict()
+            if match: return record(match.groups())
 
     def _compile_rules(self, rules=()):
-        """Compiles a set of command rules as regular expressions"""
+        """Compiles a set of command rules into a dispatch table"""
 
-        return tuple(self._compile(*rule) for rule in rules)
+        return {r[0].order: self._compile(*r) for r in rules}
 
-    def _compile(self, pattern, childs=()):
+    def _compile(self, record, pattern, childs=()):
         """Builds a rule and compiles it into a regular expression"""
 
         group = '|'.join(childs + (self._skip,))
         arguments = f'(?:(?:{ group }){ self._stop })*'
-        regex = f'{ pattern }{ arguments }'
+        regex = re.compile(f'{ pattern }{ self._stop }{ arguments }')
+        groups = sorted(regex.groupindex, key=regex.groupindex.get)
+
+        if tuple(groups) != record.fields:
+            raise ValueError(f'Rule groups do not match { record.__name__ }')
 
-        return re.compile(regex)
+        return (record, regex)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from threading import Lock
+
+
+class RankedReports(object):
+    """
+    Aggregates the info reports of a MultiPV search. The latest report
+    with a score or a variation is kept for each rank, so a consumer can
+    obtain all the candidate moves of a single search at any time.
+    """
+
+    def __init__(self):
+        self._reports = dict()
+        self._lock = Lock()
+
+    def update(self, report):
+        """Stores a report if it carries a score or a variation"""
+
+        has_score = report.cp is not None or report.mate is not None
+        has_variation = report.pv is not None
+        is_updated = has_score or has_variation
+
+        if is_updated is True:
+            rank = report.multipv or 1
+
+            with self._lock:
+                self._reports[rank] = report
+
+        return is_updated
+
+    def clear(self):
+        """Forgets all the reports of the previous search"""
+
+        with self._lock:
+            self._reports.clear()
+
+    def get_report(self, rank=1):
+        """Latest report for the given rank or none"""
+
+        return self._reports.get(rank)
+
+    def get_ranking(self):
+        """Latest report of each rank sorted by rank"""
+
+        with self._lock:
+            ranks = sorted(self._reports)
+            ranking = tuple(self._reports[rank] for rank in ranks)
+
+        return ranking
+
+    def __len__(self):
+        return len(self._reports)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class Field(object):
+    """A typed field of a record, converted when it is accessed"""
+
+    __slots__ = ('index', 'type')
+
+    def __init__(self, index, type=str):
+        self.index = index
+        self.type = type
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+
+        value = record._values[self.index]
+
+        return value if value is None else self.type(value)
+
+
+class Record(object):
+    """
+    A parsed engine response. Records keep the raw values matched by
+    the parser and only convert the fields that are actually read.
+    """
+
+    __slots__ = ('_values',)
+
+    order = None
+    fields = ()
+
+    def __init__(self, values=()):
+        self._values = values
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        items = vars(cls).items()
+        fields = sorted((v.index, n) for n, v in items if isinstance(v, Field))
+        cls.fields = tuple(name for index, name in fields)
+
+    def get(self, name, default=None):
+        """Value of a field or the default if it is not set"""
+
+        value = getattr(self, name, None)
+
+        return default if value is None else value
+
+    def __repr__(self):
+        names = self.fields
+        fields = ', '.join(f'{ n }={ getattr(self, n)!r}' for n in names)
+        return f'{ type(self).__name__ }({ fields })'
+
+
+class UciOkRecord(Record):
+    """An uciok response"""
+
+    __slots__ = ()
+    order = 'uciok'
+
+
+class ReadyOkRecord(Record):
+    """A readyok response"""
+
+    __slots__ = ()
+    order = 'readyok'
+
+
+class IdRecord(Record):
+    """An id response"""
+
+    __slots__ = ()
+    order = 'id'
+
+    name = Field(0)
+    author = Field(1)
+
+
+class BestMoveRecord(Record):
+    """
+    A bestmove response. The `request` attribute is set by the client
+    to the request identifier of the search it answers.
+    """
+
+    __slots__ = ('request',)
+    order = 'bestmove'
+
+    move = Field(0)
+    ponder = Field(1)
+
+    def __init__(self, values=()):
+        super().__init__(values)
+        self.request = None
+
+
+class OptionRecord(Record):
+    """An option response"""
+
+    __slots__ = ()
+    order = 'option'
+
+    name = Field(0)
+    type = Field(1)
+    min = Field(2, int)
+    max = Field(3, int)
+    var = Field(4)
+    default = Field(5)
+
+
+class InfoRecord(Record):
+    """
+    An info response. The `number`, `ponder` and `request` attributes
+    are set by the client to the move number, ponder move and request
+    identifier of the search.
+    """
+
+    __slots__ = ('number', 'ponder', 'request')
+    order = 'info'
+
+    string = Field(0)
+    depth = Field(1, int)
+    seldepth = Field(2, int)
+    time = Field(3, int)
+    nodes = Field(4, int)
+    pv = Field(5)
+    multipv = Field(6, int)
+    currmove = Field(7)
+    currmovenumber = Field(8, int)
+    hashfull = Field(9, int)
+    nps = Field(10, int)
+    tbhits = Field(11, int)
+    sbhits = Field(12, int)
+    cpuload = Field(13, int)
+    refutation = Field(14)
+    cp = Field(15, int)
+    mate = Field(16, int)
+    type = Field(17)
+    cpu = Field(18, int)
+    moves = Field(19)
+
+    def __init__(self, values=()):
+        self._values = values
+        self.number = None
+        self.ponder = None
+        self.request = None
+
+    def __repr__(self):
+        names = self.fields + ('number', 'ponder', 'request')
+        fields = ', '.join(f'{ n }={ getattr(self, n)!r}' for n in names)
+        return f'{ type(self).__name__ }({ fields })'
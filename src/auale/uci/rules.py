@@ -17,6 +17,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .parser import Parser
+from .records import BestMoveRecord
+from .records import IdRecord
+from .records import InfoRecord
+from .records import OptionRecord
+from .records import ReadyOkRecord
+from .records import UciOkRecord
 
 # =============================================================================
 # Token types
@@ -36,16 +42,16 @@ WORD = r'\S+'
 # =============================================================================
 
 RULES = (
-    (rf'(?P<order>uciok)',),
-    (rf'(?P<order>readyok)',),
-    (rf'(?P<order>id)', (
+    (UciOkRecord, r'uciok'),
+    (ReadyOkRecord, r'readyok'),
+    (IdRecord, r'id', (
         rf'name\s+(?P<name>{ STRING })',
         rf'author\s+(?P<author>{ STRING })',
     )),
-    (rf'(?P<order>bestmove)\s+(?P<move>{ NULL_MOVE }|{ MOVE })', (
+    (BestMoveRecord, rf'bestmove\s+(?P<move>{ NULL_MOVE }|{ MOVE })', (
         rf'ponder\s+(?P<ponder>{ MOVE })',
     )),
-    (rf'(?P<order>option)', (
+    (OptionRecord, r'option', (
         rf'name\s+(?P<name>{ WORD })',
         rf'type\s+(?P<type>{ OPTION_TYPE })',
         rf'min\s+(?P<min>{ INTEGER })',
@@ -53,7 +59,7 @@ RULES = (
         rf'var\s+(?P<var>{ WORD })',
         rf'default\s+(?P<default>{ WORD })',
     )),
-    (rf'(?P<order>info)', (
+    (InfoRecord, r'info', (
         rf'string\s+(?P<string>{ STRING })',
         rf'depth\s+(?P<depth>{ NUMBER })',
         rf'seldepth\s+(?P<seldepth>{ NUMBER })',
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from threading import Lock
+
+
+class TimeManager(object):
+    """
+    Allocates the time of each engine search from the base time of the
+    playing strength. Forced moves and positions the engine can solve
+    are searched for a minimal time; otherwise the base time is scaled
+    by the game phase, the number of legal moves and the behaviour of
+    the previous search: unstable searches, where the best move changed
+    between iterations, and the first search out of the book get extra
+    time. Reports must be fed to the manager while a search is timed.
+    """
+
+    __endgame_seeds = 6
+    __minimum_time = 20
+    __maximum_factor = 2.0
+    __opening_seeds = 40
+    __ending_seeds = 16
+    __instability_step = 0.25
+    __instability_limit = 4
+    __book_exit_factor = 1.5
+
+    def __init__(self, endgame_seeds=__endgame_seeds):
+        self._endgame_seeds = endgame_seeds
+        self._is_tracking = False
+        self._best_move = None
+        self._changes = 0
+        self._reports = 0
+        self._last_changes = 0
+        self._was_book_move = False
+        self._lock = Lock()
+
+    def get_endgame_seeds(self):
+        """Seeds on the board below which the engine solves a position"""
+
+        return self._endgame_seeds
+
+    def set_endgame_seeds(self, seeds):
+        """Sets the seeds below which the engine solves a position"""
+
+        self._endgame_seeds = seeds
+
+    def allocate(self, match, timeout):
+        """Milliseconds to search a match given a base time"""
+
+        with self._lock:
+            factor = self._get_time_factor(match)
+            self._start_tracking()
+
+        maximum = int(timeout * self.__maximum_factor)
+        milliseconds = int(timeout * factor)
+        milliseconds = max(self.__minimum_time, min(maximum, milliseconds))
+
+        return milliseconds
+
+    def update(self, report):
+        """Tracks the best move changes of the timed search"""
+
+        if report.depth is None or report.pv is None:
+            return
+
+        if report.multipv is not None and report.multipv != 1:
+            return
+
+        with self._lock:
+            if self._is_tracking is True:
+                move = report.pv.lstrip()[:1]
+                has_changed = self._best_move not in (None, move)
+                self._changes += 1 if has_changed else 0
+                self._best_move = move
+                self._reports += 1
+
+    def finish(self):
+        """Stops tracking reports once the timed search ended"""
+
+        with self._lock:
+            if self._is_tracking is True:
+                self._is_tracking = False
+                self._last_changes = self._changes
+                self._was_book_move = self._reports == 0
+
+    def _start_tracking(self):
+        """Starts tracking the reports of a new timed search"""
+
+        self._is_tracking = True
+        self._best_move = None
+        self._changes = 0
+        self._reports = 0
+
+    def _get_time_factor(self, match):
+        """Fraction of the base time to spend on a match position"""
+
+        moves = match.get_legal_moves()
+        seeds = sum(match.get_board()[:12])
+
+        if len(moves) < 2 or self._is_solved(seeds):
+            return 0.0
+
+        factor = self._get_phase_factor(seeds)
+        factor *= self._get_branching_factor(len(moves))
+        factor *= self._get_instability_factor()
+
+        if self._was_book_move is True:
+            factor *= self.__book_exit_factor
+
+        return factor
+
+    def _is_solved(self, seeds):
+        """If the engine solves positions with the given seeds"""
+
+        endgame_seeds = self._endgame_seeds
+
+        return endgame_seeds is not None and seeds <= endgame_seeds
+
+    def _get_phase_factor(self, seeds):
+        """Time factor for the game phase of a position"""
+
+        if seeds >= self.__opening_seeds:
+            return 0.8
+
+        if seeds <= self.__ending_seeds:
+            return 0.8
+
+        return 1.2
+
+    def _get_branching_factor(self, count):
+        """Time factor for the number of legal moves"""
+
+        return (count + 3) / 9.0
+
+    def _get_instability_factor(self):
+        """Time factor for the instability of the previous search"""
+
+        changes = min(self._last_changes, self.__instability_limit)
+        factor = 1.0 + changes * self.__instability_step
+
+        return factor
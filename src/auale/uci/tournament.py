@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+import logging
+import math
+import time
+
+from collections import namedtuple
+from game import Match
+
+from .async_engine import AsyncEngine
+
+Contestant = namedtuple('Contestant', (
+    'command',  # Command that starts the engine
+    'strength', # Playing strength of the engine
+))
+
+
+class Tournament(object):
+    """
+    Plays games between two engines without a user interface. Each game
+    starts from one of the given openings, which are played twice with
+    the sides swapped. Several games are played at once, each worker
+    driving its own pair of engine processes, and every finished game
+    is handed to a callback as soon as it ends.
+    """
+
+    __max_length = 600
+
+    def __init__(self, first, second, games=2, workers=1):
+        self._contestants = (first, second)
+        self._games = games
+        self._workers = workers
+        self._openings = []
+        self._logger = logging.getLogger('uci')
+        self._callback = None
+
+        self._scores = []
+        self._names = [None, None]
+        self._move_times = [0.0, 0.0]
+        self._move_counts = [0, 0]
+        self._elapsed = 0.0
+
+    def add_opening(self, match):
+        """Adds an opening position to play from"""
+
+        self._openings.append(match)
+
+    def set_callback(self, callback):
+        """Function called with each match once it is finished"""
+
+        self._callback = callback
+
+    def get_names(self):
+        """Names the engines reported for themselves"""
+
+        return tuple(self._names)
+
+    def get_scores(self):
+        """Points scored by the first engine on each game"""
+
+        return tuple(self._scores)
+
+    def get_games_per_hour(self):
+        """Number of games finished per hour of play"""
+
+        count = len(self._scores)
+        rate = 3600 * count / self._elapsed if self._elapsed else 0.0
+
+        return rate
+
+    def get_move_time(self, index):
+        """Average seconds an engine took for each move"""
+
+        count = self._move_counts[index]
+        average = self._move_times[index] / count if count else 0.0
+
+        return average
+
+    def get_elo_difference(self):
+        """
+        Elo difference of the first engine over the second one and the
+        margin of its 95% confidence interval.
+        """
+
+        count = len(self._scores)
+
+        if count == 0:
+            return (0.0, math.inf)
+
+        score = sum(self._scores) / count
+        deviation = sum((s - score) ** 2 for s in self._scores) / count
+        margin = 1.96 * math.sqrt(deviation / count)
+
+        elo = self._to_elo(score)
+        upper = self._to_elo(score + margin)
+        lower = self._to_elo(score - margin)
+
+        return (elo, (upper - lower) / 2)
+
+    def run(self):
+        """Plays all the games and waits for them"""
+
+        asyncio.run(self.play())
+
+    async def play(self):
+        """Plays all the games"""
+
+        if not self._openings:
+            raise ValueError('No opening positions were given')
+
+        queue = asyncio.Queue()
+        workers = min(self._workers, self._games)
+        start_time = time.monotonic()
+
+        for number in range(self._games):
+            queue.put_nowait(number)
+
+        try:
+            tasks = [self._run_worker(queue) for i in range(workers)]
+            await asyncio.gather(*tasks)
+        finally:
+            self._elapsed = time.monotonic() - start_time
+
+    async def _run_worker(self, queue):
+        """Plays games from the queue with its own pair of engines"""
+
+        engines = []
+
+        try:
+            for contestant in self._contestants:
+                engines.append(await self._start_engine(contestant))
+
+            while not queue.empty():
+                number = queue.get_nowait()
+                await self._play_game(engines, number)
+        finally:
+            for engine in engines:
+                await engine.quit()
+
+    async def _start_engine(self, contestant):
+        """Starts an engine process for a contestant"""
+
+        engine = AsyncEngine(contestant.command)
+        await engine.start()
+        engine.set_playing_strength(contestant.strength)
+
+        return engine
+
+    async def _play_game(self, engines, number):
+        """Plays a game and records its outcome"""
+
+        opening = self._openings[(number // 2) % len(self._openings)]
+        match = self._replay_opening(opening)
+        swapped = number % 2 == 1
+        players = engines[::-1] if swapped else engines
+        indices = (1, 0) if swapped else (0, 1)
+
+        for engine in engines:
+            await engine.start_new_match(match)
+
+        reason = await self._play_moves(match, players, indices)
+        winner = self._get_winner(match, reason)
+        score = 0.5 if winner == 0 else float(winner == (1, -1)[swapped])
+
+        self._names = [e.get_player_name() for e in engines]
+        self._scores.append(score)
+        self._tag_match(match, players, number, reason)
+
+        if self._callback is not None:
+            self._callback(match)
+
+        return score
+
+    async def _play_moves(self, match, players, indices):
+        """Plays moves until the match ends or is adjudicated"""
+
+        game = match.get_game()
+
+        while not match.has_ended():
+            if match.get_length() >= self.__max_length:
+                return 'adjudication'
+
+            turn = 0 if match.get_turn() == game.SOUTH else 1
+            engine = players[turn]
+            start_time = time.monotonic()
+            bestmove = await engine.start_thinking(match)
+            elapsed = time.monotonic() - start_time
+
+            self._move_times[indices[turn]] += elapsed
+            self._move_counts[indices[turn]] += 1
+
+            try:
+                move = game.to_move(bestmove.move)
+            except (AttributeError, TypeError, ValueError):
+                return 'forfeit'
+
+            if not match.is_legal_move(move):
+                return 'forfeit'
+
+            match.add_move(move)
+
+        return None
+
+    def _replay_opening(self, opening):
+        """New match with the position and moves of an opening"""
+
+        game = opening.get_game()
+        board, turn = opening.get_position(0)
+        match = Match(game)
+        match.set_position(board, turn)
+
+        if board != game.get_initial_board():
+            notation = game.to_board_notation(board, turn)
+            match.set_tag('FEN', notation)
+
+        for move in opening.get_moves()[:opening.get_current_index()]:
+            match.add_move(move)
+
+        return match
+
+    def _get_winner(self, match, reason):
+        """Winner of a match: 1 for south, -1 for north or zero"""
+
+        game = match.get_game()
+        board = match.get_board()
+        winner = match.get_winner()
+
+        if reason == 'forfeit':
+            winner = -match.get_turn()
+        elif reason == 'adjudication':
+            board = game.get_final_board(board)
+            winner = (board[12] > board[13]) - (board[12] < board[13])
+
+        return winner
+
+    def _tag_match(self, match, players, number, reason):
+        """Sets the tags that describe a tournament game"""
+
+        match.set_tag('Event', 'Engine tournament')
+        match.set_tag('Round', str(1 + number))
+        match.set_tag('Date', time.strftime('%Y.%m.%d'))
+        match.set_tag('South', players[0].get_player_name())
+        match.set_tag('North', players[1].get_player_name())
+
+        if reason is not None:
+            match.set_tag('Termination', reason)
+
+    def _to_elo(self, score):
+        """Elo difference that corresponds to an expected score"""
+
+        score = min(max(score, 1e-6), 1 - 1e-6)
+        elo = -400 * math.log10(1 / score - 1)
+
+        return elo
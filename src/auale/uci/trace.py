@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import json
+import os
+import re
+import time
+
+from threading import Lock
+
+
+class ProtocolTrace(object):
+    """
+    Writes a JSON lines trace of the commands sent to an engine and its
+    responses. Each entry has a monotonic timestamp relative to the
+    start of the trace and, when applicable, the time the engine took
+    to send the first info after a go, to reply to a go or a stop with
+    a bestmove, the time it was idle before a go and the reported nodes
+    per second.
+    """
+
+    __counter = 0
+    __directory = None
+    __nps_regex = re.compile(r'\bnps\s+(\d+)')
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._origin = time.monotonic()
+        self._go_time = None
+        self._stop_time = None
+        self._idle_time = None
+        self._is_awaiting_info = False
+
+    @staticmethod
+    def get_directory():
+        """Directory where new engine traces are written or none"""
+
+        return ProtocolTrace.__directory
+
+    @staticmethod
+    def set_directory(path):
+        """Enables tracing new engines to the given directory"""
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+        ProtocolTrace.__directory = path
+
+    @staticmethod
+    def open_default():
+        """Opens a trace for a new engine if tracing is enabled"""
+
+        directory = ProtocolTrace.__directory
+
+        if directory is None:
+            return None
+
+        ProtocolTrace.__counter += 1
+        name = f'engine-{ os.getpid() }-{ ProtocolTrace.__counter }.jsonl'
+        trace = ProtocolTrace(os.path.join(directory, name))
+
+        return trace
+
+    def get_path(self):
+        """Path of the trace file"""
+
+        return self._path
+
+    def command(self, line):
+        """Records a command sent to the engine"""
+
+        now = time.monotonic()
+        entry = {'t': now - self._origin, 'dir': '>', 'line': line}
+
+        with self._lock:
+            if line.startswith('go'):
+                if self._idle_time is not None:
+                    entry['idle'] = now - self._idle_time
+
+                self._go_time = now
+                self._stop_time = None
+                self._idle_time = None
+                self._is_awaiting_info = True
+            elif line == 'stop':
+                self._stop_time = now
+
+            self._write_entry(entry)
+
+    def response(self, line):
+        """Records a response received from the engine"""
+
+        now = time.monotonic()
+        entry = {'t': now - self._origin, 'dir': '<', 'line': line}
+
+        with self._lock:
+            if line.startswith('info'):
+                if self._is_awaiting_info and self._go_time is not None:
+                    entry['first_info'] = now - self._go_time
+                    self._is_awaiting_info = False
+
+                match = self.__nps_regex.search(line)
+                if match: entry['nps'] = int(match.group(1))
+            elif line.startswith('bestmove'):
+                if self._go_time is not None:
+                    entry['search'] = now - self._go_time
+
+                if self._stop_time is not None:
+                    entry['stop'] = now - self._stop_time
+
+                self._go_time = None
+                self._stop_time = None
+                self._idle_time = now
+                self._is_awaiting_info = False
+
+            self._write_entry(entry)
+
+            if 'search' in entry:
+                self._file.flush()
+
+    def close(self):
+        """Flushes and closes the trace file"""
+
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _write_entry(self, entry):
+        """Appends an entry to the trace file"""
+
+        if not self._file.closed:
+            line = json.dumps(entry, ensure_ascii=False)
+            self._file.write(f'{ line }\n')
@@ -40,6 +40,7 @@ PACKAGE_CONFIG = dict(
         'auale.uci',
         'auale.book',
         'auale.game',
+        'auale.search',
         'auale.sdl2',
         'auale.gui',
         'auale.i18n',
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+import sys
+import unittest
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_PATH, os.pardir, 'src', 'auale'))
+
+from search import UCIService
+from uci.rules import parser
+
+
+class TestUCIService(unittest.TestCase):
+    """Responses of the built-in UCI engine"""
+
+    def run_service(self, *commands):
+        """Runs the service on the given commands and parses its output"""
+
+        filein = io.StringIO(''.join(f'{ c }\n' for c in commands))
+        fileout = io.StringIO()
+        UCIService(filein, fileout).run()
+        lines = fileout.getvalue().splitlines()
+
+        return [parser.parse(line) for line in lines]
+
+    def test_bestmove_without_legal_moves(self):
+        """A position without legal moves is answered with a null move"""
+
+        records = self.run_service(
+            'position fen 0-0-0-0-0-0-0-0-0-0-0-1-24-23-S',
+            'go movetime 100',
+            'isready')
+
+        bestmoves = [r for r in records if r and r.order == 'bestmove']
+        self.assertEqual(1, len(bestmoves))
+        self.assertEqual('0000', bestmoves[0].move)
+        self.assertIsNone(bestmoves[0].ponder)
+
+    def test_bestmove_with_legal_moves(self):
+        """A position with legal moves is answered with one of them"""
+
+        records = self.run_service('position startpos', 'go depth 2')
+        bestmoves = [r for r in records if r and r.order == 'bestmove']
+        self.assertEqual(1, len(bestmoves))
+        self.assertIn(bestmoves[0].move, 'ABCDEF')
+
+
+if __name__ == '__main__':
+    unittest.main()
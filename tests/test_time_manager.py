@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import sys
+import unittest
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_PATH, os.pardir, 'src', 'auale'))
+
+from game import Match
+from game import Oware
+from uci.timing import TimeManager
+
+
+class TestTimeManager(unittest.TestCase):
+    """Search times allocated by the time manager"""
+
+    ENDGAME_BOARD = (1, 1, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0, 22, 21)
+    MIDDLE_BOARD = (3, 3, 3, 0, 0, 0, 2, 2, 2, 2, 2, 2, 12, 15)
+
+    def create_match(self, board):
+        """New match on the given board with south to move"""
+
+        match = Match(Oware)
+        match.set_position(board, Oware.SOUTH)
+
+        return match
+
+    def test_endgame_is_searched_for_minimal_time(self):
+        """Positions with few seeds are solved instead of searched"""
+
+        manager = TimeManager()
+        match = self.create_match(self.ENDGAME_BOARD)
+        self.assertGreater(len(match.get_legal_moves()), 1)
+        self.assertEqual(20, manager.allocate(match, 1000))
+
+    def test_endgame_threshold_can_be_disabled(self):
+        """Without an endgame threshold few seeds are searched"""
+
+        manager = TimeManager(endgame_seeds=None)
+        match = self.create_match(self.ENDGAME_BOARD)
+        self.assertGreater(manager.allocate(match, 1000), 20)
+
+    def test_middle_game_gets_more_time(self):
+        """Middle game positions get more time than solved ones"""
+
+        manager = TimeManager()
+        endgame = self.create_match(self.ENDGAME_BOARD)
+        middle = self.create_match(self.MIDDLE_BOARD)
+        self.assertGreater(
+            manager.allocate(middle, 1000),
+            manager.allocate(endgame, 1000))
+
+
+if __name__ == '__main__':
+    unittest.main()
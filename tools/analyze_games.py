@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Annotates every position of a set of OGN files with engine scores. The
+results are appended to a JSON lines file; running the same command
+again resumes an interrupted analysis.
+
+Usage: python3 tools/analyze_games.py [options] results.jsonl game.ogn...
+"""
+
+import argparse
+import logging
+import os
+import shlex
+import sys
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_PATH, os.pardir, 'src', 'auale'))
+
+from serialize import OGNSerializer
+from uci import AnalysisRunner
+from uci import Strength
+
+
+def parse_arguments():
+    """Parses the command line arguments"""
+
+    parser = argparse.ArgumentParser(description='Analyse oware games')
+    parser.add_argument('results', help='JSON lines file for the results')
+    parser.add_argument('files', nargs='+', help='OGN files to analyse')
+    parser.add_argument('--engine', required=True, help='engine command')
+    parser.add_argument('--workers', type=int, help='engines to run')
+    parser.add_argument('--multipv', type=int, default=1,
+        help='candidate moves to store for each position')
+    parser.add_argument('--strength', default='hard',
+        choices=[s.name.lower() for s in Strength])
+
+    return parser.parse_args()
+
+
+def main():
+    """Analyses the given games"""
+
+    logging.basicConfig(level=logging.WARNING)
+
+    args = parse_arguments()
+    command = shlex.split(args.engine)
+    strength = Strength[args.strength.upper()]
+    runner = AnalysisRunner(command, args.results, args.workers)
+    serializer = OGNSerializer()
+
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as file:
+            match = serializer.load(file)
+            runner.add_match(match, os.path.realpath(path))
+
+    print(f'Completed positions: { runner.get_completed_count() }')
+    print(f'Pending positions: { runner.get_pending_count() }')
+
+    runner.set_playing_strength(strength)
+    runner.set_multipv(args.multipv)
+    runner.run()
+
+    print(f'Analysed positions: { runner.get_completed_count() }')
+    print(f'Failed positions: { runner.get_failure_count() }')
+
+
+if __name__ == '__main__':
+    main()
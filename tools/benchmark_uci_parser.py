@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Micro-benchmark of the UCI response parser. Compares the dispatch on the
+first token into records against the previous parser, which tried every
+rule in turn and built a dictionary of values.
+
+Usage: python3 tools/benchmark_uci_parser.py [repetitions]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_PATH, os.pardir, 'src', 'auale'))
+
+from uci.rules import parser
+from uci.rules import INTEGER
+from uci.rules import MOVE
+from uci.rules import NULL_MOVE
+from uci.rules import NUMBER
+from uci.rules import OPTION_TYPE
+from uci.rules import SCORE_TYPE
+from uci.rules import STRING
+from uci.rules import WORD
+
+RESPONSES = (
+    'info depth 12 seldepth 20 score cp -35 nodes 1234567 nps 4000000 '
+    'time 300 pv AbCdEfAbCdEf',
+    'info depth 13 seldepth 22 score cp 12 lowerbound nodes 2345678 '
+    'nps 4100000 time 570 pv BcDaEfAb',
+    'info currmove A currmovenumber 2 hashfull 300',
+    'info string searching the opening book',
+    'bestmove A ponder b',
+)
+
+
+BASELINE_RULES = (
+    (rf'(?P<order>uciok)',),
+    (rf'(?P<order>readyok)',),
+    (rf'(?P<order>id)', (
+        rf'name\s+(?P<name>{ STRING })',
+        rf'author\s+(?P<author>{ STRING })',
+    )),
+    (rf'(?P<order>bestmove)\s+(?P<move>{ NULL_MOVE }|{ MOVE })', (
+        rf'ponder\s+(?P<ponder>{ MOVE })',
+    )),
+    (rf'(?P<order>option)', (
+        rf'name\s+(?P<name>{ WORD })',
+        rf'type\s+(?P<type>{ OPTION_TYPE })',
+        rf'min\s+(?P<min>{ INTEGER })',
+        rf'max\s+(?P<max>{ INTEGER })',
+        rf'var\s+(?P<var>{ WORD })',
+        rf'default\s+(?P<default>{ WORD })',
+    )),
+    (rf'(?P<order>info)', (
+        rf'string\s+(?P<string>{ STRING })',
+        rf'depth\s+(?P<depth>{ NUMBER })',
+        rf'seldepth\s+(?P<seldepth>{ NUMBER })',
+        rf'time\s+(?P<time>{ NUMBER })',
+        rf'nodes\s+(?P<nodes>{ NUMBER })',
+        rf'pv\s+(?P<pv>{ MOVE }+)',
+        rf'multipv\s+(?P<multipv>{ NUMBER })',
+        rf'currmove\s+(?P<currmove>{ MOVE })',
+        rf'currmovenumber\s+(?P<currmovenumber>{ NUMBER })',
+        rf'hashfull\s+(?P<hashfull>{ NUMBER })',
+        rf'nps\s+(?P<nps>{ NUMBER })',
+        rf'tbhits\s+(?P<tbhits>{ NUMBER })',
+        rf'sbhits\s+(?P<sbhits>{ NUMBER })',
+        rf'cpuload\s+(?P<cpuload>{ NUMBER })',
+        rf'refutation\s+(?P<refutation>{ MOVE }+)',
+        rf'score(?:\s+(?:%s|%s|%s))+' % (
+            rf'cp\s+(?P<cp>{ INTEGER })',
+            rf'mate\s+(?P<mate>{ INTEGER })',
+            rf'(?P<type>{ SCORE_TYPE })',
+        ),
+        rf'currline\s+(?:%s\s+)?%s' % (
+            rf'(?P<cpu>{ NUMBER })',
+            rf'(?P<moves>{ MOVE }+)',
+        ),
+    )),
+)
+
+
+class BaselineParser(object):
+    """The previous parser, which produced plain dictionaries"""
+
+    def __init__(self, rules):
+        self._skip = r'\S*'
+        self._stop = r'(?:\s+|$)'
+        self._patterns = tuple(self._compile(*rule) for rule in rules)
+
+    def parse(self, line):
+        """Converts a string into a dictionary of values"""
+
+        haystack = line.split('\n', 1)[0]
+        haystack = haystack.strip()
+
+        for pattern in self._patterns:
+            match = pattern.match(haystack)
+            if match: return match.groupdict()
+
+    def _compile(self, pattern, childs=()):
+        """Builds a rule and compiles it into a regular expression"""
+
+        group = '|'.join(childs + (self._skip,))
+        arguments = f'(?:(?:{ group }){ self._stop })*'
+        regex = f'{ pattern }{ arguments }'
+
+        return re.compile(regex)
+
+
+baseline = BaselineParser(BASELINE_RULES)
+
+
+def measure(function, repetitions):
+    """Microseconds per response for the given parse function"""
+
+    def run():
+        for response in RESPONSES:
+            function(response)
+
+    seconds = min(timeit.repeat(run, number=repetitions, repeat=5))
+    count = repetitions * len(RESPONSES)
+
+    return 1e6 * seconds / count
+
+
+def main(repetitions=20000):
+    """Prints the timings of each parsing strategy"""
+
+    for name, function in (
+        ('baseline', baseline.parse),
+        ('dispatched', parser.parse),
+    ):
+        micros = measure(function, repetitions)
+        rate = 1e6 / micros
+        print(f'{ name:>10s}: { micros:6.2f} µs/line { rate:10.0f} lines/s')
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Plays a tournament between two UCI engines without the user interface.
+Games start from opening positions picked from the opening book or read
+from a file with a position notation on each line. The games are saved
+to an OGN file as they finish.
+
+Usage: python3 tools/run_tournament.py [options] games.ogn
+"""
+
+import argparse
+import os
+import random
+import shlex
+import sys
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(BASE_PATH, os.pardir, 'src', 'auale')
+BOOK_PATH = os.path.join(SOURCE_PATH, 'data', 'engine', 'oware-book.bin')
+sys.path.insert(0, SOURCE_PATH)
+
+from book import OpeningBook
+from game import Match
+from game import Oware
+from serialize import OGNSerializer
+from uci import Contestant
+from uci import Strength
+from uci import Tournament
+
+
+def parse_arguments():
+    """Parses the command line arguments"""
+
+    strengths = [s.name.lower() for s in Strength]
+    parser = argparse.ArgumentParser(description='Engine tournament')
+    parser.add_argument('output', help='OGN file for the played games')
+    parser.add_argument('--first', required=True, help='engine command')
+    parser.add_argument('--second', required=True, help='engine command')
+    parser.add_argument('--first-strength', default='hard', choices=strengths)
+    parser.add_argument('--second-strength', default='hard', choices=strengths)
+    parser.add_argument('--games', type=int, default=2, help='games to play')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() // 2 or 1,
+        help='games to play at once')
+    parser.add_argument('--book', default=BOOK_PATH, help='opening book')
+    parser.add_argument('--plies', type=int, default=6,
+        help='book moves of each opening')
+    parser.add_argument('--positions', help='file with opening positions')
+    parser.add_argument('--seed', type=int, help='random seed for openings')
+
+    return parser.parse_args()
+
+
+def read_positions(path):
+    """Creates an opening for each position notation on a file"""
+
+    openings = []
+
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                match = Match(Oware)
+                board, turn = Oware.to_position(line.strip())
+                match.set_position(board, turn)
+                openings.append(match)
+
+    return openings
+
+
+def pick_openings(path, count, plies):
+    """Plays random book moves to obtain a set of openings"""
+
+    openings = []
+    book = OpeningBook(path)
+    book.set_strength(Strength.EASY)
+
+    for number in range(count):
+        match = Match(Oware)
+
+        for ply in range(plies):
+            move = book.pick_best_move(match)
+            if move is None: break
+            match.add_move(move)
+
+        openings.append(match)
+
+    return openings
+
+
+def main():
+    """Plays the tournament and prints its results"""
+
+    args = parse_arguments()
+    random.seed(args.seed)
+
+    first = Contestant(shlex.split(args.first),
+        Strength[args.first_strength.upper()])
+    second = Contestant(shlex.split(args.second),
+        Strength[args.second_strength.upper()])
+
+    if args.positions is not None:
+        openings = read_positions(args.positions)
+    else:
+        count = (args.games + 1) // 2
+        openings = pick_openings(args.book, count, args.plies)
+
+    serializer = OGNSerializer()
+    tournament = Tournament(first, second, args.games, args.workers)
+
+    for match in openings:
+        tournament.add_opening(match)
+
+    with open(args.output, 'wb') as file:
+        def on_game_finished(match):
+            if file.tell() > 0:
+                file.write(b'\n')
+
+            serializer.dump_all((match,), file)
+            file.flush()
+
+        tournament.set_callback(on_game_finished)
+        tournament.run()
+
+    names = tournament.get_names()
+    scores = tournament.get_scores()
+    elo, margin = tournament.get_elo_difference()
+    wins = scores.count(1.0)
+    draws = scores.count(0.5)
+    losses = scores.count(0.0)
+
+    print(f'{ names[0] } vs { names[1] }')
+    print(f'Games: { len(scores) } (+{ wins } ={ draws } -{ losses })')
+    print(f'Elo difference: { elo:+.1f} ± { margin:.1f}')
+    print(f'Games per hour: { tournament.get_games_per_hour():.1f}')
+    print(f'Move time: { tournament.get_move_time(0):.3f} s, '
+          f'{ tournament.get_move_time(1):.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Aualé oware graphic user interface.
+# Copyright (C) 2014-2020 Joan Sala Soler <contact@joansala.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Summarizes engine protocol traces written with the --trace option. Shows
+the latency from go to the first info and to the bestmove, the time the
+engine took to answer a stop, the idle gaps between searches and the
+nodes per second reported over time.
+
+Usage: python3 tools/summarize_trace.py [--window seconds] trace.jsonl...
+"""
+
+import argparse
+import json
+import statistics
+
+LATENCIES = (
+    ('first_info', 'Go to first info'),
+    ('search', 'Go to bestmove'),
+    ('stop', 'Stop to bestmove'),
+    ('idle', 'Idle before go'),
+)
+
+
+def parse_arguments():
+    """Parses the command line arguments"""
+
+    parser = argparse.ArgumentParser(description='Summarize UCI traces')
+    parser.add_argument('traces', nargs='+', help='trace files')
+    parser.add_argument('--window', type=float, default=10.0,
+        help='seconds of each nodes per second window')
+
+    return parser.parse_args()
+
+
+def read_entries(path):
+    """Yields the entries of a trace file"""
+
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                pass
+
+
+def percentile(values, fraction):
+    """Value below which the given fraction of values fall"""
+
+    index = int(fraction * (len(values) - 1))
+    value = sorted(values)[index]
+
+    return value
+
+
+def format_latencies(name, values):
+    """Formats the statistics of a latency in milliseconds"""
+
+    if not values:
+        return f'{ name:<18} { 0:>6}'
+
+    ms = [1000 * v for v in values]
+    mean = statistics.mean(ms)
+    median = statistics.median(ms)
+    p95 = percentile(ms, 0.95)
+    maximum = max(ms)
+
+    return (
+        f'{ name:<18} { len(ms):>6} { mean:>10.1f} { median:>10.1f} '
+        f'{ p95:>10.1f} { maximum:>10.1f}'
+    )
+
+
+def summarize(path, window):
+    """Prints the summary of a trace file"""
+
+    commands = 0
+    responses = 0
+    latencies = {key: [] for key, name in LATENCIES}
+    windows = dict()
+
+    for entry in read_entries(path):
+        if entry['dir'] == '>':
+            commands += 1
+        else:
+            responses += 1
+
+        for key in latencies:
+            if key in entry:
+                latencies[key].append(entry[key])
+
+        if 'nps' in entry:
+            index = int(entry['t'] // window)
+            windows.setdefault(index, []).append(entry['nps'])
+
+    print(path)
+    print(f'Commands: { commands }, responses: { responses }')
+    print()
+    print(f'{ "Latency (ms)":<18} { "count":>6} { "mean":>10} '
+          f'{ "median":>10} { "p95":>10} { "max":>10}')
+
+    for key, name in LATENCIES:
+        print(format_latencies(name, latencies[key]))
+
+    if windows:
+        print()
+        print(f'{ "Time (s)":<18} { "reports":>6} { "mean nps":>10} '
+              f'{ "max nps":>10}')
+
+    for index in sorted(windows):
+        values = windows[index]
+        start = f'{ index * window:.0f}-{ (index + 1) * window:.0f}'
+        mean = statistics.mean(values)
+        print(f'{ start:<18} { len(values):>6} { mean:>10.0f} '
+              f'{ max(values):>10}')
+
+    print()
+
+
+def main():
+    """Summarizes the given traces"""
+
+    args = parse_arguments()
+
+    for path in args.traces:
+        summarize(path, args.window)
+
+
+if __name__ == '__main__':
+    main()